@@ -0,0 +1,390 @@
+"""HTTP load test for the booking flows.
+
+Drives the API with concurrent clients, either in process (``src.main:app``
+through ``httpx.ASGITransport``, the default) or against a running server
+given with ``--base-url``. Every run creates its own cinema, hall, movie,
+showtimes and users through the API, so it can be pointed at any
+disposable database; the database named by ``DATABASE_URL`` is also used
+directly to make sure a genre exists, as the API has no endpoint for it.
+
+Scenarios (run all by default, or pick some with ``--scenario``):
+
+``catalog``
+    Movie, showtime and cinema listings.
+``seats``
+    Seat map polling; clients revalidate with ``If-None-Match``.
+``flash-sale``
+    Every client grabs best-available blocks of one showtime until it is
+    sold out.
+``approve``
+    Clients hold seats, then an admin approves them, half one by one and
+    half in bulk waves.
+
+For each endpoint the report lists request count, throughput, error count
+(5xx and transport errors) and p50/p95/p99 latency. Results are written as
+JSON (``benchmarks/results/<timestamp>.json`` unless ``--output`` is given);
+pass an earlier file as ``--baseline`` to print the change in p95 latency and
+throughput per endpoint. Client behaviour is driven by ``--seed``, so two runs
+with the same arguments send the same requests::
+
+    python -m benchmarks.loadtest --clients 20 --requests 200
+    python -m benchmarks.loadtest --base-url http://localhost:8000 --scenario flash-sale
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+import httpx
+
+API = "/api/v1"
+RESULTS_DIR = Path(__file__).parent / "results"
+HALL_ROWS = 20
+HALL_COLUMNS = 30
+CATALOG_SHOWTIMES = 24
+MOVIE_DURATION = 120
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+class Recorder:
+    """Latencies and status codes per endpoint for one scenario."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    def add(self, endpoint: str, seconds: float, status: str) -> None:
+        self.latencies[endpoint].append(seconds)
+        self.statuses[endpoint][status] += 1
+
+    def summary(self, duration: float) -> dict:
+        endpoints = {}
+        for endpoint, latencies in sorted(self.latencies.items()):
+            ordered = sorted(latencies)
+            statuses = self.statuses[endpoint]
+            endpoints[endpoint] = {
+                "requests": len(ordered),
+                "throughput_rps": round(len(ordered) / duration, 2) if duration else 0.0,
+                "errors": sum(count for status, count in statuses.items()
+                              if status == "error" or status.startswith("5")),
+                "statuses": dict(sorted(statuses.items())),
+                "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+                "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+                "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+                "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+                "max_ms": round(ordered[-1] * 1000, 3),
+            }
+        return {"duration_s": round(duration, 3), "endpoints": endpoints}
+
+
+class Session:
+    """An HTTP client that records every request under an endpoint name."""
+
+    def __init__(self, http: httpx.AsyncClient, recorder: Optional[Recorder] = None, token: Optional[str] = None):
+        self.http = http
+        self.recorder = recorder
+        self.headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    def with_token(self, token: str) -> "Session":
+        return Session(self.http, self.recorder, token)
+
+    def recording(self, recorder: Recorder) -> "Session":
+        session = Session(self.http, recorder)
+        session.headers = self.headers
+        return session
+
+    async def request(self, endpoint: str, method: str, path: str, expect=(200, 201), **kwargs) -> Optional[httpx.Response]:
+        """
+        Send a request, timing it under ``endpoint``.
+
+        Returns ``None`` on transport errors. During setup (no recorder) any
+        status outside ``expect`` aborts the run.
+        """
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        start = time.perf_counter()
+        try:
+            response = await self.http.request(method, API + path, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            if self.recorder is None:
+                raise
+            self.recorder.add(endpoint, time.perf_counter() - start, "error")
+            return None
+        if self.recorder is not None:
+            self.recorder.add(endpoint, time.perf_counter() - start, str(response.status_code))
+        elif response.status_code not in expect:
+            raise RuntimeError(f"Setup request {method} {path} failed: {response.status_code} {response.text}")
+        return response
+
+
+class Fixture:
+    """Data created for one run."""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.admin: Optional[Session] = None
+        self.users: List[Session] = []
+        self.cinema_id = 0
+        self.hall_id = 0
+        self.movie_id = 0
+        self.showtime_ids: List[int] = []
+        self.next_start = datetime(2031, 1, 1, 9)
+
+    async def add_showtime(self) -> int:
+        start = self.next_start
+        self.next_start += timedelta(minutes=MOVIE_DURATION + 30)
+        response = await self.admin.request("setup", "POST", "/admin/showtime", json={
+            "movie_id": self.movie_id,
+            "hall_id": self.hall_id,
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(minutes=MOVIE_DURATION)).isoformat(),
+            "price": 12.5,
+        })
+        return response.json()["id"]
+
+
+async def _ensure_genre() -> int:
+    from sqlalchemy import select
+    from src import models  # noqa: F401  (configures every mapper)
+    from src.database import SessionLocal, engine
+    from src.features.genre.models import Genre
+    async with SessionLocal() as db:
+        genre_id = await db.scalar(select(Genre.id).order_by(Genre.id).limit(1))
+        if genre_id is None:
+            genre = Genre(name="Benchmark")
+            db.add(genre)
+            await db.commit()
+            genre_id = genre.id
+    await engine.dispose()
+    return genre_id
+
+
+async def _login(session: Session, email: str, role: str) -> Session:
+    await session.request("setup", "POST", "/auth/register", json={
+        "email": email, "full_name": "Load Test", "password": "loadtest", "role": role})
+    response = await session.request("setup", "POST", "/auth/login",
+                                     data={"username": email, "password": "loadtest"})
+    return session.with_token(response.json()["access_token"])
+
+
+async def setup(http: httpx.AsyncClient, clients: int, genre_id: int) -> Fixture:
+    fixture = Fixture(uuid.uuid4().hex[:8])
+    anonymous = Session(http)
+    fixture.admin = await _login(anonymous, f"admin-{fixture.run_id}@loadtest.example", "ADMIN")
+    fixture.users = list(await asyncio.gather(*(
+        _login(anonymous, f"user-{fixture.run_id}-{index}@loadtest.example", "USER")
+        for index in range(clients))))
+    admin = fixture.admin
+    fixture.cinema_id = (await admin.request("setup", "POST", "/admin/cinema", json={
+        "name": f"Load test {fixture.run_id}", "address": "Benchmark street"})).json()["id"]
+    fixture.hall_id = (await admin.request("setup", "POST", "/admin/hall", json={
+        "name": "Main", "rows": HALL_ROWS, "columns": HALL_COLUMNS,
+        "cinema_id": fixture.cinema_id})).json()["id"]
+    fixture.movie_id = (await admin.request("setup", "POST", "/admin/movie", json={
+        "title": f"Load test {fixture.run_id}", "genre_id": genre_id,
+        "duration": MOVIE_DURATION, "release_date": "2030-01-01"})).json()["id"]
+    for _ in range(CATALOG_SHOWTIMES):
+        fixture.showtime_ids.append(await fixture.add_showtime())
+    return fixture
+
+
+async def scenario_catalog(fixture: Fixture, recorder: Recorder, requests: int, rng: random.Random) -> None:
+    async def client(session: Session, rng: random.Random) -> None:
+        for _ in range(requests):
+            choice = rng.random()
+            if choice < 0.3:
+                await session.request("GET /movie/", "GET", "/movie/")
+            elif choice < 0.6:
+                await session.request("GET /showtime/?movie_id", "GET", "/showtime/",
+                                      params={"movie_id": fixture.movie_id})
+            elif choice < 0.8:
+                await session.request("GET /cinema/", "GET", "/cinema/")
+            else:
+                await session.request("GET /cinema/{id}/showtimes", "GET",
+                                      f"/cinema/{fixture.cinema_id}/showtimes")
+
+    await asyncio.gather(*(client(user.recording(recorder), random.Random(rng.random()))
+                           for user in fixture.users))
+
+
+async def scenario_seats(fixture: Fixture, recorder: Recorder, requests: int, rng: random.Random) -> None:
+    async def client(session: Session, rng: random.Random) -> None:
+        etags: Dict[int, str] = {}
+        for _ in range(requests):
+            showtime_id = rng.choice(fixture.showtime_ids)
+            headers = {"If-None-Match": etags[showtime_id]} if showtime_id in etags else {}
+            response = await session.request("GET /reservation/showtime/{id}/seats", "GET",
+                                             f"/reservation/showtime/{showtime_id}/seats", headers=headers)
+            if response is not None and "ETag" in response.headers:
+                etags[showtime_id] = response.headers["ETag"]
+
+    await asyncio.gather(*(client(user.recording(recorder), random.Random(rng.random()))
+                           for user in fixture.users))
+
+
+async def scenario_flash_sale(fixture: Fixture, recorder: Recorder, requests: int, rng: random.Random) -> None:
+    showtime_id = await fixture.add_showtime()
+
+    async def client(session: Session, rng: random.Random) -> None:
+        for _ in range(requests):
+            response = await session.request("POST /reservation/best", "POST", "/reservation/best", json={
+                "showtime_id": showtime_id, "size": rng.randint(1, 4)})
+            if response is not None and response.status_code == 409 and "adjacent" in response.text:
+                return
+
+    await asyncio.gather(*(client(user.recording(recorder), random.Random(rng.random()))
+                           for user in fixture.users))
+
+
+async def scenario_approve(fixture: Fixture, recorder: Recorder, requests: int, rng: random.Random,
+                           wave_size: int) -> None:
+    showtime_id = await fixture.add_showtime()
+    seats_per_client = max(1, min(requests, HALL_ROWS * HALL_COLUMNS // len(fixture.users)))
+    labels = [f"{chr(ord('A') + row)}{column + 1}"
+              for row in range(HALL_ROWS) for column in range(HALL_COLUMNS)]
+    rng.shuffle(labels)
+
+    async def hold(index: int, session: Session) -> List[int]:
+        seats = labels[index * seats_per_client:(index + 1) * seats_per_client]
+        ids = []
+        for start in range(0, len(seats), 5):
+            response = await session.request("POST /reservation/batch", "POST", "/reservation/batch", json={
+                "showtime_id": showtime_id, "seat_numbers": seats[start:start + 5]})
+            if response is not None and response.status_code == 201:
+                ids.extend(reservation["id"] for reservation in response.json())
+        return ids
+
+    held = await asyncio.gather(*(hold(index, user.recording(recorder))
+                                  for index, user in enumerate(fixture.users)))
+    ids = sorted(reservation_id for client_ids in held for reservation_id in client_ids)
+    admin = fixture.admin.recording(recorder)
+    one_by_one, bulk = ids[:len(ids) // 2], ids[len(ids) // 2:]
+    queue = iter(one_by_one)
+
+    async def approver() -> None:
+        for reservation_id in queue:
+            await admin.request("POST /admin/reservation/{id}/approve", "POST",
+                                f"/admin/reservation/{reservation_id}/approve")
+
+    await asyncio.gather(*(approver() for _ in fixture.users))
+    for start in range(0, len(bulk), wave_size):
+        await admin.request("POST /admin/reservation/bulk/approve", "POST", "/admin/reservation/bulk/approve",
+                            json={"ids": bulk[start:start + wave_size]})
+
+
+SCENARIOS = {
+    "catalog": scenario_catalog,
+    "seats": scenario_seats,
+    "flash-sale": scenario_flash_sale,
+    "approve": scenario_approve,
+}
+
+
+@asynccontextmanager
+async def open_client(base_url: Optional[str], clients: int) -> AsyncIterator[httpx.AsyncClient]:
+    limits = httpx.Limits(max_connections=clients + 1, max_keepalive_connections=clients + 1)
+    timeout = httpx.Timeout(60.0)
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as http:
+            yield http
+        return
+    from src.main import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest",
+                                     limits=limits, timeout=timeout) as http:
+            yield http
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results: dict, baseline: Optional[dict]) -> None:
+    header = f"{'endpoint':<40} {'reqs':>6} {'rps':>9} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    for name, scenario in results["scenarios"].items():
+        print(f"\n== {name} ({scenario['duration_s']} s)")
+        print(header + ("  p95 vs base  rps vs base" if baseline else ""))
+        base_endpoints = (baseline or {}).get("scenarios", {}).get(name, {}).get("endpoints", {})
+        for endpoint, stats in scenario["endpoints"].items():
+            line = (f"{endpoint:<40} {stats['requests']:>6} {stats['throughput_rps']:>9.1f} {stats['errors']:>5} "
+                    f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}")
+            base = base_endpoints.get(endpoint)
+            if base and base["p95_ms"] and base["throughput_rps"]:
+                line += (f"  {(stats['p95_ms'] / base['p95_ms'] - 1) * 100:>+10.1f}%"
+                         f"  {(stats['throughput_rps'] / base['throughput_rps'] - 1) * 100:>+9.1f}%")
+            print(line)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    genre_id = await _ensure_genre()
+    rng = random.Random(args.seed)
+    results = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "target": args.base_url or "in-process",
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "clients": args.clients,
+            "requests_per_client": args.requests,
+            "seed": args.seed,
+        },
+        "scenarios": {},
+    }
+    async with open_client(args.base_url, args.clients) as http:
+        fixture = await setup(http, args.clients, genre_id)
+        for name in args.scenario or list(SCENARIOS):
+            recorder = Recorder()
+            extra = {"wave_size": args.wave_size} if name == "approve" else {}
+            start = time.perf_counter()
+            await SCENARIOS[name](fixture, recorder, args.requests, rng, **extra)
+            results["scenarios"][name] = recorder.summary(time.perf_counter() - start)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", help="server to test (default: src.main:app in process)")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="scenario to run; repeat for several (default: all)")
+    parser.add_argument("--clients", type=int, default=20, help="concurrent clients (default: 20)")
+    parser.add_argument("--requests", type=int, default=200,
+                        help="requests per client and scenario (default: 200)")
+    parser.add_argument("--wave-size", type=int, default=100,
+                        help="reservations per bulk approval in the approve scenario (default: 100)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    results = asyncio.run(run(args))
+    output = args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print_report(results, baseline)
+    print(f"\nResults written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
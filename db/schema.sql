@@ -22,6 +22,8 @@ CREATE TABLE movie (
     poster_url VARCHAR(255)
 );
 
+CREATE INDEX ix_movie_genre_id_release_date ON movie (genre_id, release_date);
+
 CREATE TABLE hall (
     id SERIAL PRIMARY KEY,
     cinema_id INTEGER REFERENCES cinema(id) NOT NULL,
@@ -30,6 +32,8 @@ CREATE TABLE hall (
     columns INTEGER NOT NULL
 );
 
+CREATE INDEX ix_hall_cinema_id ON hall (cinema_id);
+
 CREATE TABLE showtime (
     id SERIAL PRIMARY KEY,
     movie_id INTEGER REFERENCES movie(id),
@@ -39,6 +43,13 @@ CREATE TABLE showtime (
     price DECIMAL(10, 2) NOT NULL
 );
 
+-- Day schedules filter on a start_time range, optionally for one movie
+CREATE INDEX ix_showtime_start_time ON showtime (start_time);
+CREATE INDEX ix_showtime_movie_id_start_time ON showtime (movie_id, start_time);
+CREATE INDEX ix_showtime_hall_id_start_time ON showtime (hall_id, start_time);
+-- Range lookups for hall overlap checks
+CREATE INDEX ix_showtime_time_range ON showtime USING gist (tsrange(start_time, end_time));
+
 CREATE TABLE users (
     id SERIAL PRIMARY KEY,
     email VARCHAR(255) UNIQUE NOT NULL,
@@ -56,9 +67,35 @@ CREATE TABLE reservation (
     seat_number VARCHAR(10) NOT NULL,
     price DECIMAL(10, 2) NOT NULL,
     status VARCHAR(20) CHECK (status IN ('PENDING', 'CONFIRMED', 'CANCELED')) NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP
+);
+
+-- At most one active (PENDING or CONFIRMED) reservation per seat and showtime
+CREATE UNIQUE INDEX uq_reservation_active_seat ON reservation (showtime_id, seat_number)
+    WHERE status IN ('PENDING', 'CONFIRMED');
+CREATE INDEX ix_reservation_showtime_id_status ON reservation (showtime_id, status);
+CREATE INDEX ix_reservation_user_id ON reservation (user_id);
+-- Lets the hold reaper find lapsed PENDING holds
+CREATE INDEX ix_reservation_pending_expires_at ON reservation (expires_at)
+    WHERE status = 'PENDING';
+-- Sales by time: partial days of sales totals and hourly breakdowns
+CREATE INDEX ix_reservation_confirmed_created_at ON reservation (created_at)
+    WHERE status = 'CONFIRMED';
+
+-- Confirmed sales per showtime and day, kept current by the admin services
+CREATE TABLE sales_rollup (
+    showtime_id INTEGER REFERENCES showtime(id),
+    day DATE NOT NULL,
+    cinema_id INTEGER REFERENCES cinema(id) NOT NULL,
+    total_amount DECIMAL(12, 2) NOT NULL,
+    ticket_count INTEGER NOT NULL,
+    PRIMARY KEY (showtime_id, day)
 );
 
+CREATE INDEX ix_sales_rollup_cinema_id_day ON sales_rollup (cinema_id, day);
+CREATE INDEX ix_sales_rollup_day ON sales_rollup (day);
+
 -- Insert initial genres
 INSERT INTO genre (name) VALUES
 ('Action'), ('Comedy'), ('Drama'), ('Sci-Fi'), ('Horror'),
@@ -0,0 +1,114 @@
+"""Initial schema
+
+Matches the tables previously created by ``Base.metadata.create_all``.
+Databases created that way can be adopted with ``alembic stamp 0001``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 06:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('cinema',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('address', sa.String(length=255), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_cinema_id'), 'cinema', ['id'], unique=False)
+    op.create_table('genre',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_genre_id'), 'genre', ['id'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.String(length=20), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=False),
+    sa.Column('phone_number', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_table('hall',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cinema_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('rows', sa.Integer(), nullable=False),
+    sa.Column('columns', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['cinema_id'], ['cinema.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_hall_id'), 'hall', ['id'], unique=False)
+    op.create_table('movie',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('genre_id', sa.Integer(), nullable=False),
+    sa.Column('duration', sa.Integer(), nullable=False),
+    sa.Column('release_date', sa.Date(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('poster_url', sa.String(length=255), nullable=True),
+    sa.ForeignKeyConstraint(['genre_id'], ['genre.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_movie_id'), 'movie', ['id'], unique=False)
+    op.create_table('showtime',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('hall_id', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['hall_id'], ['hall.id'], ),
+    sa.ForeignKeyConstraint(['movie_id'], ['movie.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('movie_id', 'hall_id', 'start_time', name='unique_showtime')
+    )
+    op.create_index(op.f('ix_showtime_id'), 'showtime', ['id'], unique=False)
+    op.create_table('reservation',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('showtime_id', sa.Integer(), nullable=False),
+    sa.Column('seat_number', sa.String(length=10), nullable=False),
+    sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['showtime_id'], ['showtime.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reservation_id'), 'reservation', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_reservation_id'), table_name='reservation')
+    op.drop_table('reservation')
+    op.drop_index(op.f('ix_showtime_id'), table_name='showtime')
+    op.drop_table('showtime')
+    op.drop_index(op.f('ix_movie_id'), table_name='movie')
+    op.drop_table('movie')
+    op.drop_index(op.f('ix_hall_id'), table_name='hall')
+    op.drop_table('hall')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_genre_id'), table_name='genre')
+    op.drop_table('genre')
+    op.drop_index(op.f('ix_cinema_id'), table_name='cinema')
+    op.drop_table('cinema')
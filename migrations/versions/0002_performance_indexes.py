@@ -0,0 +1,98 @@
+"""Performance indexes and integrity constraints
+
+Adds the indexes behind the hot lookups in the services, the partial unique
+index that stops two active reservations from sharing a seat, and CHECK
+constraints on reservation status and user role. Indexes are created with
+IF NOT EXISTS so databases that already picked some of them up through
+``create_all`` can be upgraded as well.
+
+Existing rows are brought in line first: roles and statuses are upper-cased
+where that makes them valid, unknown roles become USER and unknown statuses
+CANCELED, and of several active reservations for one seat only the first
+CONFIRMED one (else the oldest) stays active; the others are CANCELED. The
+counts are logged. This cleanup is not undone on downgrade.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 06:00:01
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _clean_existing_rows() -> None:
+    bind = op.get_bind()
+    roles = bind.execute(sa.text(
+        "UPDATE users SET role = CASE WHEN upper(role) IN ('ADMIN', 'USER') "
+        "THEN upper(role) ELSE 'USER' END "
+        "WHERE role NOT IN ('ADMIN', 'USER')")).rowcount
+    statuses = bind.execute(sa.text(
+        "UPDATE reservation SET status = CASE WHEN upper(status) IN ('PENDING', 'CONFIRMED', 'CANCELED') "
+        "THEN upper(status) ELSE 'CANCELED' END "
+        "WHERE status NOT IN ('PENDING', 'CONFIRMED', 'CANCELED')")).rowcount
+    duplicates = bind.execute(sa.text(
+        "UPDATE reservation SET status = 'CANCELED' FROM ("
+        " SELECT id, row_number() OVER ("
+        "  PARTITION BY showtime_id, seat_number"
+        "  ORDER BY status = 'CONFIRMED' DESC, created_at NULLS LAST, id) AS position"
+        " FROM reservation WHERE status IN ('PENDING', 'CONFIRMED')"
+        ") AS ranked "
+        "WHERE reservation.id = ranked.id AND ranked.position > 1")).rowcount
+    if roles:
+        logger.warning(f"Normalized {roles} invalid user roles")
+    if statuses:
+        logger.warning(f"Normalized {statuses} invalid reservation statuses")
+    if duplicates:
+        logger.warning(f"Canceled {duplicates} reservations that double-booked a seat")
+
+
+def upgrade() -> None:
+    _clean_existing_rows()
+    op.create_index('ix_hall_cinema_id', 'hall', ['cinema_id'],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_movie_genre_id_release_date', 'movie', ['genre_id', 'release_date'],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_showtime_start_time', 'showtime', ['start_time'],
+                    unique=False, if_not_exists=True)
+    # Also serves lookups on movie_id alone
+    op.create_index('ix_showtime_movie_id_start_time', 'showtime', ['movie_id', 'start_time'],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_showtime_hall_id_start_time', 'showtime', ['hall_id', 'start_time'],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_reservation_showtime_id_status', 'reservation', ['showtime_id', 'status'],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_reservation_user_id', 'reservation', ['user_id'],
+                    unique=False, if_not_exists=True)
+    op.create_index('uq_reservation_active_seat', 'reservation', ['showtime_id', 'seat_number'],
+                    unique=True, if_not_exists=True,
+                    postgresql_where=sa.text("status IN ('PENDING', 'CONFIRMED')"))
+    op.create_check_constraint('ck_users_role', 'users',
+                               "role IN ('ADMIN', 'USER')")
+    op.create_check_constraint('ck_reservation_status', 'reservation',
+                               "status IN ('PENDING', 'CONFIRMED', 'CANCELED')")
+
+
+def downgrade() -> None:
+    op.drop_constraint('ck_reservation_status', 'reservation', type_='check')
+    op.drop_constraint('ck_users_role', 'users', type_='check')
+    op.drop_index('uq_reservation_active_seat', table_name='reservation')
+    op.drop_index('ix_reservation_user_id', table_name='reservation')
+    op.drop_index('ix_reservation_showtime_id_status', table_name='reservation')
+    op.drop_index('ix_showtime_hall_id_start_time', table_name='showtime')
+    op.drop_index('ix_showtime_movie_id_start_time', table_name='showtime')
+    op.drop_index('ix_showtime_start_time', table_name='showtime')
+    op.drop_index('ix_movie_genre_id_release_date', table_name='movie')
+    op.drop_index('ix_hall_cinema_id', table_name='hall')
@@ -0,0 +1,52 @@
+"""Sales rollup table
+
+Adds ``sales_rollup`` (confirmed sales per showtime and day) and fills it
+from the existing confirmed reservations.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 07:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('sales_rollup',
+    sa.Column('showtime_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('cinema_id', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('ticket_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['cinema_id'], ['cinema.id'], ),
+    sa.ForeignKeyConstraint(['showtime_id'], ['showtime.id'], ),
+    sa.PrimaryKeyConstraint('showtime_id', 'day')
+    )
+    op.create_index('ix_sales_rollup_cinema_id_day', 'sales_rollup', ['cinema_id', 'day'], unique=False)
+    op.create_index('ix_sales_rollup_day', 'sales_rollup', ['day'], unique=False)
+    op.execute("""
+        INSERT INTO sales_rollup (cinema_id, showtime_id, day, total_amount, ticket_count)
+        SELECT hall.cinema_id, reservation.showtime_id, CAST(reservation.created_at AS DATE),
+               SUM(reservation.price), COUNT(*)
+        FROM reservation
+        JOIN showtime ON reservation.showtime_id = showtime.id
+        JOIN hall ON showtime.hall_id = hall.id
+        WHERE reservation.status = 'CONFIRMED'
+        GROUP BY hall.cinema_id, reservation.showtime_id, CAST(reservation.created_at AS DATE)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sales_rollup_day', table_name='sales_rollup')
+    op.drop_index('ix_sales_rollup_cinema_id_day', table_name='sales_rollup')
+    op.drop_table('sales_rollup')
@@ -0,0 +1,33 @@
+"""Seat hold expiry
+
+Adds ``reservation.expires_at`` and a partial index over pending holds for
+the reaper. Holds created before this revision have no expiry and are left
+for an admin to decide.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 08:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('reservation', sa.Column('expires_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_reservation_pending_expires_at', 'reservation', ['expires_at'],
+                    unique=False, postgresql_where=sa.text("status = 'PENDING'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reservation_pending_expires_at', table_name='reservation')
+    op.drop_column('reservation', 'expires_at')
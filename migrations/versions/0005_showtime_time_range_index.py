@@ -0,0 +1,50 @@
+"""Showtime time-range index
+
+Adds a GiST index on ``tsrange(start_time, end_time)`` used by the hall
+overlap checks.
+
+``tsrange`` rejects a lower bound above the upper one, so showtimes that do
+not end after they start are repaired first: their end is set to the start
+plus the movie's duration. The count is logged. This repair is not undone on
+downgrade.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 09:00:00
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _repair_inverted_showtimes() -> None:
+    repaired = op.get_bind().execute(sa.text(
+        "UPDATE showtime SET end_time = showtime.start_time"
+        " + make_interval(mins => greatest(movie.duration, 1)) "
+        "FROM movie WHERE movie.id = showtime.movie_id"
+        " AND showtime.end_time <= showtime.start_time")).rowcount
+    if repaired:
+        logger.warning(f"Set the end time of {repaired} showtimes that did not end after they started")
+
+
+def upgrade() -> None:
+    _repair_inverted_showtimes()
+    op.create_index('ix_showtime_time_range', 'showtime',
+                    [sa.text('tsrange(start_time, end_time)')],
+                    unique=False, postgresql_using='gist')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_showtime_time_range', table_name='showtime')
@@ -0,0 +1,31 @@
+"""Confirmed sales index
+
+Adds a partial index on ``reservation.created_at`` over confirmed
+reservations, used for the partial days of sales totals and for hourly
+sales breakdowns.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_reservation_confirmed_created_at', 'reservation', ['created_at'],
+                    unique=False, postgresql_where=sa.text("status = 'CONFIRMED'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reservation_confirmed_created_at', table_name='reservation')
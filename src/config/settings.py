@@ -6,6 +6,49 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ENVIRONMENT: str = "development"
 
+    # Connection pool
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+
+    # Authenticated-user cache
+    AUTH_USER_CACHE_SIZE: int = 10000
+    AUTH_USER_CACHE_TTL: float = 60.0
+
+    # List endpoint page sizes
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+
+    # Catalog response cache
+    RESPONSE_CACHE_SIZE: int = 1024
+    RESPONSE_CACHE_TTL: float = 300.0
+
+    # Minimum time between two showtimes in the same hall
+    SHOWTIME_CLEANING_GAP_MINUTES: int = 15
+
+    # Seat holds (PENDING reservations)
+    SEAT_HOLD_TTL: float = 600.0
+    SEAT_HOLD_REAP_INTERVAL: float = 15.0
+    SEAT_HOLD_REAP_BATCH: int = 500
+
+    # Per-worker seat maps: how many are kept and how long before one is re-read
+    SEAT_INVENTORY_SIZE: int = 2000
+    SEAT_INVENTORY_TTL: float = 30.0
+
+    # Seat availability streams
+    SEAT_STREAM_QUEUE_SIZE: int = 256
+    SEAT_STREAM_HEARTBEAT: float = 15.0
+
+    # Warn when one statement runs more often than this in a request
+    QUERY_REPEAT_WARN_THRESHOLD: int = 10
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey, Numeric, Index
+from src.database import Base
+
+
+class SalesRollup(Base):
+    """Confirmed sales per showtime and day, maintained by ``admin.rollup``."""
+    __tablename__ = "sales_rollup"
+    showtime_id = Column(Integer, ForeignKey("showtime.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    cinema_id = Column(Integer, ForeignKey("cinema.id"), nullable=False)
+    total_amount = Column(Numeric(12, 2), nullable=False, default=0)
+    ticket_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('ix_sales_rollup_cinema_id_day', 'cinema_id', 'day'),
+        Index('ix_sales_rollup_day', 'day'),
+    )
@@ -0,0 +1,138 @@
+"""Maintenance of the ``sales_rollup`` table.
+
+Every change to a confirmed reservation is applied to its showtime/day row
+with :func:`record_sale` inside the same transaction, so the rollup always
+matches ``SUM(reservation.price)`` over confirmed reservations. Sales are
+bucketed by the day the reservation was created.
+
+If the table ever drifts (manual SQL, restored backups), rebuild it from the
+reservation table with::
+
+    python -m src.features.admin.rollup
+"""
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, Optional, Tuple
+from sqlalchemy import Date, Integer, cast, column, delete, func, select, text, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src import models  # noqa: F401  (configures every mapper for the CLI)
+from src.database import SessionLocal, engine
+from src.features.hall.models import Hall
+from src.features.showtime.models import Showtime
+from src.features.reservation.models import Reservation, Status
+from .models import SalesRollup
+
+_ROLLUP_COLUMNS = ["cinema_id", "showtime_id",
+                   "day", "total_amount", "ticket_count"]
+
+
+async def record_sale(reservation: Reservation, sign: int, db: AsyncSession) -> None:
+    """
+    Add (``sign=1``) or remove (``sign=-1``) one confirmed reservation.
+
+    Runs as a single upsert; the caller commits.
+    """
+    await record_sales(
+        [(reservation.showtime_id, reservation.created_at, reservation.price)], sign, db)
+
+
+async def record_sales(
+    sales: Iterable[Tuple[int, datetime, Decimal]],
+    sign: int,
+    db: AsyncSession
+) -> None:
+    """
+    Add or remove many ``(showtime_id, created_at, price)`` sales at once.
+
+    Sales are summed per showtime/day first and applied with one upsert;
+    the caller commits.
+    """
+    totals = defaultdict(lambda: [Decimal(0), 0])
+    for showtime_id, created_at, price in sales:
+        total = totals[showtime_id, created_at.date()]
+        total[0] += price * sign
+        total[1] += sign
+    if not totals:
+        return
+    rows = values(
+        column("showtime_id", Integer),
+        column("day", Date),
+        column("total_amount", SalesRollup.total_amount.type),
+        column("ticket_count", Integer),
+        name="sales",
+    ).data([(showtime_id, day, amount, count)
+            for (showtime_id, day), (amount, count) in totals.items()])
+    stmt = insert(SalesRollup).from_select(_ROLLUP_COLUMNS, select(
+        Hall.cinema_id,
+        rows.c.showtime_id,
+        rows.c.day,
+        rows.c.total_amount,
+        rows.c.ticket_count,
+    ).join(Showtime, Showtime.id == rows.c.showtime_id).join(
+        Hall, Showtime.hall_id == Hall.id))
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[SalesRollup.showtime_id, SalesRollup.day],
+        set_={
+            "total_amount": SalesRollup.total_amount + stmt.excluded.total_amount,
+            "ticket_count": SalesRollup.ticket_count + stmt.excluded.ticket_count,
+        },
+    ))
+
+
+async def sync_cinema(
+    db: AsyncSession,
+    hall_id: Optional[int] = None,
+    showtime_id: Optional[int] = None
+) -> None:
+    """
+    Re-point rollup rows at the cinema their showtime now belongs to.
+
+    Call after a hall moves to another cinema or a showtime moves to another
+    hall; the caller commits.
+    """
+    stmt = update(SalesRollup).values(cinema_id=Hall.cinema_id).where(
+        SalesRollup.showtime_id == Showtime.id,
+        Showtime.hall_id == Hall.id,
+    )
+    if hall_id is not None:
+        stmt = stmt.where(Hall.id == hall_id)
+    if showtime_id is not None:
+        stmt = stmt.where(Showtime.id == showtime_id)
+    await db.execute(stmt)
+
+
+async def rebuild(db: AsyncSession) -> int:
+    """Recompute the whole rollup from confirmed reservations; return its row count."""
+    # Hold off concurrent record_sale calls until the new totals are committed.
+    await db.execute(text("LOCK TABLE sales_rollup IN EXCLUSIVE MODE"))
+    await db.execute(delete(SalesRollup))
+    day = cast(Reservation.created_at, Date)
+    totals = select(
+        Hall.cinema_id,
+        Reservation.showtime_id,
+        day,
+        func.sum(Reservation.price),
+        func.count(),
+    ).join(Showtime, Reservation.showtime_id == Showtime.id).join(
+        Hall, Showtime.hall_id == Hall.id
+    ).where(Reservation.status == Status.CONFIRMED).group_by(
+        Hall.cinema_id, Reservation.showtime_id, day)
+    result = await db.execute(
+        insert(SalesRollup).from_select(_ROLLUP_COLUMNS, totals))
+    await db.commit()
+    return result.rowcount
+
+
+async def _main() -> None:
+    async with SessionLocal() as db:
+        rows = await rebuild(db)
+    await engine.dispose()
+    print(f"sales_rollup rebuilt: {rows} rows")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
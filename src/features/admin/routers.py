@@ -1,39 +1,55 @@
 import logging
-from datetime import datetime
+from datetime import date
 from typing import List, Optional
 from fastapi import APIRouter, Depends, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.database import get_db
 from src.utils.check_admin import check_admin
+from src.utils.datetimes import NaiveUTCDatetime
+from src.utils.streaming import stream_csv, stream_json_array, stream_ndjson
+from src.utils.pagination import Page, cursor_query, limit_query
 from src.features.cinema.schemas import CinemaCreate, CinemaResponse
 from src.features.hall.schemas import HallCreate, HallResponse
 from src.features.movie.schemas import MovieCreate, MovieResponse
-from src.features.showtime.schemas import ShowtimeCreate, ShowtimeResponse
+from src.features.showtime.schemas import ShowtimeCreate, ShowtimeBulkCreate, ShowtimeResponse
 from src.features.users.schemas import UserResponse
 from src.features.reservation.schemas import ReservationResponse
 from .services import (
     create_cinema, delete_cinema, update_cinema, partial_update_cinema,
     create_hall, update_hall, partial_update_hall, delete_hall,
     create_movie, update_movie, partial_update_movie, delete_movie,
-    create_showtime, update_showtime, partial_update_showtime, delete_showtime,
-    get_users_with_reservations, approve_reservation, reject_reservation,
-    get_total_sales
+    create_showtime, create_showtimes, update_showtime, partial_update_showtime, delete_showtime,
+    get_users_with_reservations, build_users_export, approve_reservation, reject_reservation,
+    approve_reservations, reject_reservations,
+    get_total_sales, build_sales_breakdown, get_sales_breakdown,
+    get_db_pool_status, get_auth_cache_status, get_response_cache_status,
+    get_seat_stream_status
 )
+from .schemas import SalesGroup, ExportFormat, ReservationBulkUpdate, ReservationBulkResult
 
 router = APIRouter(tags=["admin"], dependencies=[Depends(check_admin)])
 logger = logging.getLogger(__name__)
 
 
+def _stream_export(query: Select, format: ExportFormat, filename: str):
+    if format == ExportFormat.CSV:
+        return stream_csv(query, filename)
+    if format == ExportFormat.NDJSON:
+        return stream_ndjson(query)
+    return stream_json_array(query)
+
+
 @router.post("/cinema", response_model=CinemaResponse, status_code=status.HTTP_201_CREATED)
-async def create_cinema_endpoint(cinema: CinemaCreate, db: Session = Depends(get_db)):
+async def create_cinema_endpoint(cinema: CinemaCreate, db: AsyncSession = Depends(get_db)):
     logger.info(f"Creating cinema: {cinema.name}")
-    return create_cinema(cinema, db)
+    return await create_cinema(cinema, db)
 
 
 @router.put("/cinema/{cinema_id}", response_model=CinemaResponse)
-async def update_cinema_endpoint(cinema_id: int, cinema: CinemaCreate, db: Session = Depends(get_db)):
+async def update_cinema_endpoint(cinema_id: int, cinema: CinemaCreate, db: AsyncSession = Depends(get_db)):
     logger.info(f"Updating cinema ID: {cinema_id}")
-    return update_cinema(cinema_id, cinema, db)
+    return await update_cinema(cinema_id, cinema, db)
 
 
 @router.patch("/cinema/{cinema_id}", response_model=CinemaResponse)
@@ -41,28 +57,28 @@ async def partial_update_cinema_endpoint(
     cinema_id: int,
     name: Optional[str] = None,
     address: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     logger.info(f"Partially updating cinema ID: {cinema_id}")
-    return partial_update_cinema(cinema_id, name, address, db)
+    return await partial_update_cinema(cinema_id, name, address, db)
 
 
 @router.delete("/cinema/{cinema_id}", response_model=dict)
-async def delete_cinema_endpoint(cinema_id: int, db: Session = Depends(get_db)):
+async def delete_cinema_endpoint(cinema_id: int, db: AsyncSession = Depends(get_db)):
     logger.info(f"Deleting cinema ID: {cinema_id}")
-    return delete_cinema(cinema_id, db)
+    return await delete_cinema(cinema_id, db)
 
 
 @router.post("/hall", response_model=HallResponse, status_code=status.HTTP_201_CREATED)
-async def create_hall_endpoint(hall: HallCreate, db: Session = Depends(get_db)):
+async def create_hall_endpoint(hall: HallCreate, db: AsyncSession = Depends(get_db)):
     logger.info(f"Creating hall: {hall.name}")
-    return create_hall(hall, db)
+    return await create_hall(hall, db)
 
 
 @router.put("/hall/{hall_id}", response_model=HallResponse)
-async def update_hall_endpoint(hall_id: int, hall: HallCreate, db: Session = Depends(get_db)):
+async def update_hall_endpoint(hall_id: int, hall: HallCreate, db: AsyncSession = Depends(get_db)):
     logger.info(f"Updating hall ID: {hall_id}")
-    return update_hall(hall_id, hall, db)
+    return await update_hall(hall_id, hall, db)
 
 
 @router.patch("/hall/{hall_id}", response_model=HallResponse)
@@ -72,28 +88,28 @@ async def partial_update_hall_endpoint(
     rows: Optional[int] = None,
     columns: Optional[int] = None,
     cinema_id: Optional[int] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     logger.info(f"Partially updating hall ID: {hall_id}")
-    return partial_update_hall(hall_id, name, rows, columns, cinema_id, db)
+    return await partial_update_hall(hall_id, name, rows, columns, cinema_id, db)
 
 
 @router.delete("/hall/{hall_id}", response_model=dict)
-async def delete_hall_endpoint(hall_id: int, db: Session = Depends(get_db)):
+async def delete_hall_endpoint(hall_id: int, db: AsyncSession = Depends(get_db)):
     logger.info(f"Deleting hall ID: {hall_id}")
-    return delete_hall(hall_id, db)
+    return await delete_hall(hall_id, db)
 
 
 @router.post("/movie", response_model=MovieResponse, status_code=status.HTTP_201_CREATED)
-async def create_movie_endpoint(movie: MovieCreate, db: Session = Depends(get_db)):
+async def create_movie_endpoint(movie: MovieCreate, db: AsyncSession = Depends(get_db)):
     logger.info(f"Creating movie: {movie.title}")
-    return create_movie(movie, db)
+    return await create_movie(movie, db)
 
 
 @router.put("/movie/{movie_id}", response_model=MovieResponse)
-async def update_movie_endpoint(movie_id: int, movie: MovieCreate, db: Session = Depends(get_db)):
+async def update_movie_endpoint(movie_id: int, movie: MovieCreate, db: AsyncSession = Depends(get_db)):
     logger.info(f"Updating movie ID: {movie_id}")
-    return update_movie(movie_id, movie, db)
+    return await update_movie(movie_id, movie, db)
 
 
 @router.patch("/movie/{movie_id}", response_model=MovieResponse)
@@ -102,31 +118,38 @@ async def partial_update_movie_endpoint(
     title: Optional[str] = None,
     genre_id: Optional[int] = None,
     duration: Optional[int] = None,
-    release_date: Optional[str] = None,
+    release_date: Optional[date] = None,
     description: Optional[str] = None,
     poster_url: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     logger.info(f"Partially updating movie ID: {movie_id}")
-    return partial_update_movie(movie_id, title, genre_id, duration, release_date, description, poster_url, db)
+    return await partial_update_movie(movie_id, title, genre_id, duration, release_date, description, poster_url, db)
 
 
 @router.delete("/movie/{movie_id}", response_model=dict)
-async def delete_movie_endpoint(movie_id: int, db: Session = Depends(get_db)):
+async def delete_movie_endpoint(movie_id: int, db: AsyncSession = Depends(get_db)):
     logger.info(f"Deleting movie ID: {movie_id}")
-    return delete_movie(movie_id, db)
+    return await delete_movie(movie_id, db)
 
 
 @router.post("/showtime", response_model=ShowtimeResponse, status_code=status.HTTP_201_CREATED)
-async def create_showtime_endpoint(showtime: ShowtimeCreate, db: Session = Depends(get_db)):
+async def create_showtime_endpoint(showtime: ShowtimeCreate, db: AsyncSession = Depends(get_db)):
     logger.info(f"Creating showtime for movie ID: {showtime.movie_id}")
-    return create_showtime(showtime, db)
+    return await create_showtime(showtime, db)
+
+
+@router.post("/showtime/bulk", response_model=List[ShowtimeResponse], status_code=status.HTTP_201_CREATED)
+async def create_showtimes_endpoint(batch: ShowtimeBulkCreate, db: AsyncSession = Depends(get_db)):
+    logger.info(
+        f"Creating {len(batch.showtimes)} showtimes{' plus a recurrence' if batch.recurrence else ''}")
+    return await create_showtimes(batch, db)
 
 
 @router.put("/showtime/{showtime_id}", response_model=ShowtimeResponse)
-async def update_showtime_endpoint(showtime_id: int, showtime: ShowtimeCreate, db: Session = Depends(get_db)):
+async def update_showtime_endpoint(showtime_id: int, showtime: ShowtimeCreate, db: AsyncSession = Depends(get_db)):
     logger.info(f"Updating showtime ID: {showtime_id}")
-    return update_showtime(showtime_id, showtime, db)
+    return await update_showtime(showtime_id, showtime, db)
 
 
 @router.patch("/showtime/{showtime_id}", response_model=ShowtimeResponse)
@@ -134,50 +157,117 @@ async def partial_update_showtime_endpoint(
     showtime_id: int,
     movie_id: Optional[int] = None,
     hall_id: Optional[int] = None,
-    start_time: Optional[str] = None,
-    end_time: Optional[str] = None,
+    start_time: Optional[NaiveUTCDatetime] = None,
+    end_time: Optional[NaiveUTCDatetime] = None,
     price: Optional[float] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     logger.info(f"Partially updating showtime ID: {showtime_id}")
-    return partial_update_showtime(showtime_id, movie_id, hall_id, start_time, end_time, price, db)
+    return await partial_update_showtime(showtime_id, movie_id, hall_id, start_time, end_time, price, db)
 
 
 @router.delete("/showtime/{showtime_id}", response_model=dict)
-async def delete_showtime_endpoint(showtime_id: int, db: Session = Depends(get_db)):
+async def delete_showtime_endpoint(showtime_id: int, db: AsyncSession = Depends(get_db)):
     logger.info(f"Deleting showtime ID: {showtime_id}")
-    return delete_showtime(showtime_id, db)
+    return await delete_showtime(showtime_id, db)
 
 
-@router.get("/users", response_model=List[UserResponse])
-async def get_users_with_reservations_endpoint(db: Session = Depends(get_db)):
-    logger.info("Fetching users with reservations")
-    return get_users_with_reservations(db)
+@router.get("/users", response_model=Page[UserResponse])
+async def get_users_with_reservations_endpoint(
+    cursor: Optional[str] = cursor_query,
+    limit: int = limit_query(),
+    format: ExportFormat = Query(
+        ExportFormat.JSON, description="json for one page, or json-stream/ndjson/csv to stream every user"),
+    db: AsyncSession = Depends(get_db)
+):
+    logger.info(f"Fetching users with reservations: format={format.value}")
+    if format != ExportFormat.JSON:
+        return _stream_export(build_users_export(), format, "users.csv")
+    return await get_users_with_reservations(cursor, limit, db)
 
 
 @router.get("/total_sales", response_model=dict)
 async def get_total_sales_endpoint(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     cinema_id: Optional[int] = Query(None, description="Filter by cinema ID"),
     showtime_id: Optional[int] = Query(
         None, description="Filter by showtime ID"),
-    start_date: Optional[datetime] = Query(
+    start_date: Optional[NaiveUTCDatetime] = Query(
         None, description="Filter by start date"),
-    end_date: Optional[datetime] = Query(
+    end_date: Optional[NaiveUTCDatetime] = Query(
         None, description="Filter by end date")
 ):
     logger.info(
         f"Fetching total sales with filters: cinema_id={cinema_id}, showtime_id={showtime_id}")
-    return get_total_sales(db, cinema_id, showtime_id, start_date, end_date)
+    return await get_total_sales(db, cinema_id, showtime_id, start_date, end_date)
+
+
+@router.get("/sales")
+async def get_sales_breakdown_endpoint(
+    db: AsyncSession = Depends(get_db),
+    group_by: List[SalesGroup] = Query(
+        ..., description="Dimensions to group by; repeat for several"),
+    cinema_id: Optional[int] = Query(None, description="Filter by cinema ID"),
+    start_date: Optional[NaiveUTCDatetime] = Query(
+        None, description="Filter by start date"),
+    end_date: Optional[NaiveUTCDatetime] = Query(
+        None, description="Filter by end date"),
+    format: ExportFormat = Query(
+        ExportFormat.JSON, description="json, or json-stream/ndjson/csv to stream the rows")
+):
+    logger.info(
+        f"Fetching sales breakdown: group_by={[g.value for g in group_by]}, cinema_id={cinema_id}, format={format.value}")
+    query = await build_sales_breakdown(db, group_by, cinema_id, start_date, end_date)
+    if format != ExportFormat.JSON:
+        return _stream_export(query, format, "sales.csv")
+    return await get_sales_breakdown(query, db)
+
+
+@router.post("/reservation/bulk/approve", response_model=ReservationBulkResult)
+async def approve_reservations_endpoint(selection: ReservationBulkUpdate, db: AsyncSession = Depends(get_db)):
+    logger.info(f"Bulk approving reservations: {selection.model_dump(exclude_none=True, exclude={'ids'})}, "
+                f"ids={len(selection.ids) if selection.ids else 0}")
+    return await approve_reservations(selection, db)
+
+
+@router.post("/reservation/bulk/reject", response_model=ReservationBulkResult)
+async def reject_reservations_endpoint(selection: ReservationBulkUpdate, db: AsyncSession = Depends(get_db)):
+    logger.info(f"Bulk rejecting reservations: {selection.model_dump(exclude_none=True, exclude={'ids'})}, "
+                f"ids={len(selection.ids) if selection.ids else 0}")
+    return await reject_reservations(selection, db)
 
 
 @router.post("/reservation/{reservation_id}/approve", response_model=ReservationResponse)
-async def approve_reservation_endpoint(reservation_id: int, db: Session = Depends(get_db)):
+async def approve_reservation_endpoint(reservation_id: int, db: AsyncSession = Depends(get_db)):
     logger.info(f"Approving reservation ID: {reservation_id}")
-    return approve_reservation(reservation_id, db)
+    return await approve_reservation(reservation_id, db)
 
 
 @router.post("/reservation/{reservation_id}/reject", response_model=ReservationResponse)
-async def reject_reservation_endpoint(reservation_id: int, db: Session = Depends(get_db)):
+async def reject_reservation_endpoint(reservation_id: int, db: AsyncSession = Depends(get_db)):
     logger.info(f"Rejecting reservation ID: {reservation_id}")
-    return reject_reservation(reservation_id, db)
+    return await reject_reservation(reservation_id, db)
+
+
+@router.get("/db_pool", response_model=dict)
+async def get_db_pool_status_endpoint():
+    logger.info("Fetching database pool status")
+    return get_db_pool_status()
+
+
+@router.get("/auth_cache", response_model=dict)
+async def get_auth_cache_status_endpoint():
+    logger.info("Fetching authenticated-user cache status")
+    return get_auth_cache_status()
+
+
+@router.get("/response_cache", response_model=dict)
+async def get_response_cache_status_endpoint():
+    logger.info("Fetching catalog response cache status")
+    return get_response_cache_status()
+
+
+@router.get("/seat_streams", response_model=dict)
+async def get_seat_stream_status_endpoint():
+    logger.info("Fetching seat stream status")
+    return get_seat_stream_status()
@@ -0,0 +1,66 @@
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from src.features.reservation.schemas import Status
+
+# Upper bound on the reservations changed by one bulk approve/reject call
+MAX_BULK_RESERVATIONS = 5000
+
+
+class SalesGroup(str, Enum):
+    CINEMA = "cinema"
+    HALL = "hall"
+    MOVIE = "movie"
+    SHOWTIME = "showtime"
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+
+
+class ExportFormat(str, Enum):
+    JSON = "json"
+    JSON_STREAM = "json-stream"
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ReservationBulkUpdate(BaseModel):
+    """
+    Reservations to approve or reject: the listed ``ids``, the reservations
+    matching the filters, or the listed ``ids`` that match the filters.
+    """
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=MAX_BULK_RESERVATIONS)
+    showtime_id: Optional[int] = None
+    # Only reservations created at least this many minutes ago
+    older_than_minutes: Optional[int] = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if self.ids is None and self.showtime_id is None and self.older_than_minutes is None:
+            raise ValueError("Give reservation ids or at least one filter")
+        return self
+
+
+class BulkOutcome(str, Enum):
+    UPDATED = "updated"
+    # Not in a status the transition applies to
+    UNCHANGED = "unchanged"
+    # A PENDING hold past its expiry, which cannot be approved
+    EXPIRED = "expired"
+    # Left out by the showtime_id or older_than_minutes filter
+    NOT_MATCHED = "not_matched"
+    NOT_FOUND = "not_found"
+
+
+class ReservationBulkOutcome(BaseModel):
+    id: int
+    outcome: BulkOutcome
+    # Status after the call; absent for unknown IDs
+    status: Optional[Status] = None
+
+
+class ReservationBulkResult(BaseModel):
+    updated: int
+    results: List[ReservationBulkOutcome]
+    # More reservations match the filters than one call changes
+    has_more: bool
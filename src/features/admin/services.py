@@ -1,8 +1,10 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy.sql import func
+from sqlalchemy import DateTime, Select, and_, cast, literal, or_, select, true, union_all, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, func
 from src.features.cinema.models import Cinema
 from src.features.hall.models import Hall
 from src.features.movie.models import Movie
@@ -11,39 +13,65 @@ from src.features.users.models import User
 from src.features.reservation.models import Reservation, Status
 from src.features.cinema.schemas import CinemaCreate
 from src.features.hall.schemas import HallCreate
-from src.features.movie.schemas import MovieCreate
-from src.features.showtime.schemas import ShowtimeCreate
+from src.features.movie.schemas import MovieCreate, MovieResponse
+from src.features.showtime.overlap import check_hall_overlaps
+from src.features.showtime.schemas import (
+    ShowtimeCreate, ShowtimeBulkCreate, ShowtimeRecurrence, ShowtimeResponse, MAX_BULK_SHOWTIMES
+)
 from src.features.users.schemas import UserResponse
 from src.features.reservation.schemas import ReservationResponse
-
-
-def create_cinema(cinema: CinemaCreate, db: Session):
+from src.features.reservation.inventory import seat_inventory
+from src.features.reservation.events import seat_events
+from src.database import engine
+from src.config.settings import settings
+from src.utils.db_pool import pool_stats
+from src.features.auth.cache import user_cache
+from src.utils.response_cache import response_cache
+from src.utils.pagination import Page, keyset, make_page
+from .models import SalesRollup
+from .schemas import (
+    SalesGroup, ReservationBulkUpdate, ReservationBulkResult, ReservationBulkOutcome, BulkOutcome,
+    MAX_BULK_RESERVATIONS
+)
+from .rollup import record_sale, record_sales, sync_cinema
+
+
+async def _invalidate_showtime_listings(db: AsyncSession, *hall_ids: int) -> None:
+    """Drop cached showtime listings, including those of the cinemas owning ``hall_ids``."""
+    cinema_ids = await db.scalars(select(Hall.cinema_id).where(Hall.id.in_(hall_ids)))
+    response_cache.invalidate(
+        "showtimes", *(f"cinema:{cinema_id}:showtimes" for cinema_id in cinema_ids))
+
+
+async def create_cinema(cinema: CinemaCreate, db: AsyncSession):
     db_cinema = Cinema(**cinema.model_dump())
     db.add(db_cinema)
-    db.commit()
-    db.refresh(db_cinema)
+    await db.commit()
+    await db.refresh(db_cinema)
+    response_cache.invalidate("cinemas")
     return db_cinema
 
 
-def update_cinema(cinema_id: int, cinema: CinemaCreate, db: Session):
-    db_cinema = db.query(Cinema).filter(Cinema.id == cinema_id).first()
+async def update_cinema(cinema_id: int, cinema: CinemaCreate, db: AsyncSession):
+    db_cinema = await db.get(Cinema, cinema_id)
     if not db_cinema:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
     for key, value in cinema.model_dump().items():
         setattr(db_cinema, key, value)
-    db.commit()
-    db.refresh(db_cinema)
+    await db.commit()
+    await db.refresh(db_cinema)
+    response_cache.invalidate("cinemas")
     return db_cinema
 
 
-def partial_update_cinema(
+async def partial_update_cinema(
     cinema_id: int,
     name: Optional[str],
     address: Optional[str],
-    db: Session
+    db: AsyncSession
 ):
-    db_cinema = db.query(Cinema).filter(Cinema.id == cinema_id).first()
+    db_cinema = await db.get(Cinema, cinema_id)
     if not db_cinema:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
@@ -51,18 +79,19 @@ def partial_update_cinema(
         db_cinema.name = name
     if address is not None:
         db_cinema.address = address
-    db.commit()
-    db.refresh(db_cinema)
+    await db.commit()
+    await db.refresh(db_cinema)
+    response_cache.invalidate("cinemas")
     return db_cinema
 
 
-def delete_cinema(cinema_id: int, db: Session):
-    cinema = db.query(Cinema).filter(Cinema.id == cinema_id).first()
+async def delete_cinema(cinema_id: int, db: AsyncSession):
+    cinema = await db.get(Cinema, cinema_id)
     if not cinema:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
-    dependent_halls = db.query(Hall).filter(
-        Hall.cinema_id == cinema_id).first()
+    dependent_halls = await db.scalar(select(Hall).where(
+        Hall.cinema_id == cinema_id).limit(1))
     if dependent_halls:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -72,8 +101,15 @@ def delete_cinema(cinema_id: int, db: Session):
         detail="Deletion not allowed; please remove dependent halls first")
 
 
-def create_hall(hall: HallCreate, db: Session):
-    cinema = db.query(Cinema).filter(Cinema.id == hall.cinema_id).first()
+def _invalidate_hall_listings(old_cinema_id: int, cinema_id: int) -> None:
+    tags = {f"cinema:{old_cinema_id}:halls", f"cinema:{cinema_id}:halls"}
+    if old_cinema_id != cinema_id:
+        tags |= {f"cinema:{old_cinema_id}:showtimes", f"cinema:{cinema_id}:showtimes"}
+    response_cache.invalidate(*tags)
+
+
+async def create_hall(hall: HallCreate, db: AsyncSession):
+    cinema = await db.get(Cinema, hall.cinema_id)
     if not cinema:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
@@ -87,44 +123,53 @@ def create_hall(hall: HallCreate, db: Session):
         cinema_id=hall.cinema_id
     )
     db.add(db_hall)
-    db.commit()
-    db.refresh(db_hall)
+    await db.commit()
+    await db.refresh(db_hall)
+    response_cache.invalidate(f"cinema:{db_hall.cinema_id}:halls")
     return db_hall
 
 
-def update_hall(hall_id: int, hall: HallCreate, db: Session):
-    db_hall = db.query(Hall).filter(Hall.id == hall_id).first()
+async def update_hall(hall_id: int, hall: HallCreate, db: AsyncSession):
+    db_hall = await db.get(Hall, hall_id)
     if not db_hall:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Hall not found")
-    cinema = db.query(Cinema).filter(Cinema.id == hall.cinema_id).first()
+    cinema = await db.get(Cinema, hall.cinema_id)
     if not cinema:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
     if hall.rows <= 0 or hall.columns <= 0:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail="Rows and columns must be positive")
+    old_cinema_id = db_hall.cinema_id
+    moved = old_cinema_id != hall.cinema_id
     db_hall.name = hall.name
     db_hall.rows = hall.rows
     db_hall.columns = hall.columns
     db_hall.cinema_id = hall.cinema_id
-    db.commit()
-    db.refresh(db_hall)
+    if moved:
+        await db.flush()
+        await sync_cinema(db, hall_id=hall_id)
+    await db.commit()
+    await db.refresh(db_hall)
+    seat_inventory.invalidate_hall(hall_id)
+    _invalidate_hall_listings(old_cinema_id, db_hall.cinema_id)
     return db_hall
 
 
-def partial_update_hall(
+async def partial_update_hall(
     hall_id: int,
     name: Optional[str],
     rows: Optional[int],
     columns: Optional[int],
     cinema_id: Optional[int],
-    db: Session
+    db: AsyncSession
 ):
-    db_hall = db.query(Hall).filter(Hall.id == hall_id).first()
+    db_hall = await db.get(Hall, hall_id)
     if not db_hall:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Hall not found")
+    old_cinema_id = db_hall.cinema_id
     if name is not None:
         db_hall.name = name
     if rows is not None:
@@ -138,23 +183,27 @@ def partial_update_hall(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Columns must be positive")
         db_hall.columns = columns
     if cinema_id is not None:
-        cinema = db.query(Cinema).filter(Cinema.id == cinema_id).first()
+        cinema = await db.get(Cinema, cinema_id)
         if not cinema:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
         db_hall.cinema_id = cinema_id
-    db.commit()
-    db.refresh(db_hall)
+        await db.flush()
+        await sync_cinema(db, hall_id=hall_id)
+    await db.commit()
+    await db.refresh(db_hall)
+    seat_inventory.invalidate_hall(hall_id)
+    _invalidate_hall_listings(old_cinema_id, db_hall.cinema_id)
     return db_hall
 
 
-def delete_hall(hall_id: int, db: Session):
-    hall = db.query(Hall).filter(Hall.id == hall_id).first()
+async def delete_hall(hall_id: int, db: AsyncSession):
+    hall = await db.get(Hall, hall_id)
     if not hall:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Hall not found")
-    dependent_showtimes = db.query(Showtime).filter(
-        Showtime.hall_id == hall_id).first()
+    dependent_showtimes = await db.scalar(select(Showtime).where(
+        Showtime.hall_id == hall_id).limit(1))
     if dependent_showtimes:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -164,37 +213,39 @@ def delete_hall(hall_id: int, db: Session):
         detail="Deletion not allowed; please remove dependent showtimes first")
 
 
-def create_movie(movie: MovieCreate, db: Session):
+async def create_movie(movie: MovieCreate, db: AsyncSession):
     db_movie = Movie(**movie.model_dump())
     db.add(db_movie)
-    db.commit()
-    db.refresh(db_movie)
+    await db.commit()
+    await db.refresh(db_movie)
+    response_cache.invalidate("movies")
     return db_movie
 
 
-def update_movie(movie_id: int, movie: MovieCreate, db: Session):
-    db_movie = db.query(Movie).filter(Movie.id == movie_id).first()
+async def update_movie(movie_id: int, movie: MovieCreate, db: AsyncSession):
+    db_movie = await db.get(Movie, movie_id)
     if not db_movie:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Movie not found")
     for key, value in movie.model_dump().items():
         setattr(db_movie, key, value)
-    db.commit()
-    db.refresh(db_movie)
+    await db.commit()
+    await db.refresh(db_movie)
+    response_cache.invalidate("movies", f"movie:{movie_id}")
     return db_movie
 
 
-def partial_update_movie(
+async def partial_update_movie(
     movie_id: int,
     title: Optional[str],
     genre_id: Optional[int],
     duration: Optional[int],
-    release_date: Optional[str],
+    release_date: Optional[date],
     description: Optional[str],
     poster_url: Optional[str],
-    db: Session
+    db: AsyncSession
 ):
-    db_movie = db.query(Movie).filter(Movie.id == movie_id).first()
+    db_movie = await db.get(Movie, movie_id)
     if not db_movie:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Movie not found")
@@ -210,18 +261,19 @@ def partial_update_movie(
         db_movie.description = description
     if poster_url is not None:
         db_movie.poster_url = poster_url
-    db.commit()
-    db.refresh(db_movie)
+    await db.commit()
+    await db.refresh(db_movie)
+    response_cache.invalidate("movies", f"movie:{movie_id}")
     return db_movie
 
 
-def delete_movie(movie_id: int, db: Session):
-    movie = db.query(Movie).filter(Movie.id == movie_id).first()
+async def delete_movie(movie_id: int, db: AsyncSession):
+    movie = await db.get(Movie, movie_id)
     if not movie:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Movie not found")
-    dependent_showtimes = db.query(Showtime).filter(
-        Showtime.movie_id == movie_id).first()
+    dependent_showtimes = await db.scalar(select(Showtime).where(
+        Showtime.movie_id == movie_id).limit(1))
     if dependent_showtimes:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -231,39 +283,148 @@ def delete_movie(movie_id: int, db: Session):
         detail="Deletion not allowed; please remove dependent showtimes first")
 
 
-def create_showtime(showtime: ShowtimeCreate, db: Session):
+async def create_showtime(showtime: ShowtimeCreate, db: AsyncSession):
+    await check_hall_overlaps(db, [(showtime.hall_id, showtime.start_time, showtime.end_time, None)])
     db_showtime = Showtime(**showtime.model_dump())
     db.add(db_showtime)
-    db.commit()
-    db.refresh(db_showtime)
+    await db.commit()
+    await db.refresh(db_showtime, ["movie"])
+    await _invalidate_showtime_listings(db, db_showtime.hall_id)
     return db_showtime
 
 
-def update_showtime(showtime_id: int, showtime: ShowtimeCreate, db: Session):
-    db_showtime = db.query(Showtime).filter(Showtime.id == showtime_id).first()
+def _expand_recurrence(rule: ShowtimeRecurrence, duration: int, limit: int) -> List[dict]:
+    """Return the rule's showtimes, stopping once there are more than ``limit``."""
+    length = timedelta(minutes=duration)
+    rows = []
+    day = rule.start_date
+    while day <= rule.end_date:
+        if rule.weekdays is None or day.weekday() in rule.weekdays:
+            for hall_id in rule.hall_ids:
+                for start in rule.times:
+                    start_time = datetime.combine(day, start)
+                    rows.append({
+                        "movie_id": rule.movie_id, "hall_id": hall_id,
+                        "start_time": start_time, "end_time": start_time + length,
+                        "price": rule.price,
+                    })
+                    if len(rows) > limit:
+                        return rows
+        day += timedelta(days=1)
+    return rows
+
+
+async def create_showtimes(batch: ShowtimeBulkCreate, db: AsyncSession) -> List[ShowtimeResponse]:
+    """
+    Create many showtimes with one multi-row ``INSERT`` in one transaction.
+
+    The explicit ``showtimes`` and the expansion of ``recurrence`` (ending
+    after the movie's duration) are validated together in memory first;
+    all rows are created or none are.
+
+    Raises:
+        HTTPException (400): If the batch is too large or repeats a showtime.
+        HTTPException (404): If a movie or hall does not exist.
+        HTTPException (409): If a showtime already exists or two showtimes
+            overlap in a hall.
+    """
+    movie_ids = {showtime.movie_id for showtime in batch.showtimes}
+    hall_ids = {showtime.hall_id for showtime in batch.showtimes}
+    if batch.recurrence is not None:
+        movie_ids.add(batch.recurrence.movie_id)
+        hall_ids.update(batch.recurrence.hall_ids)
+    movies = {movie.id: movie for movie in await db.scalars(
+        select(Movie).where(Movie.id.in_(movie_ids)))}
+    if missing := sorted(movie_ids - movies.keys()):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail=f"Movie not found: {', '.join(map(str, missing))}")
+    found_halls = set(await db.scalars(select(Hall.id).where(Hall.id.in_(hall_ids))))
+    if missing := sorted(hall_ids - found_halls):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail=f"Hall not found: {', '.join(map(str, missing))}")
+
+    rows = [showtime.model_dump() for showtime in batch.showtimes]
+    if batch.recurrence is not None:
+        rows.extend(_expand_recurrence(
+            batch.recurrence, movies[batch.recurrence.movie_id].duration, MAX_BULK_SHOWTIMES - len(rows)))
+    if len(rows) > MAX_BULK_SHOWTIMES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"At most {MAX_BULK_SHOWTIMES} showtimes can be created at once")
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="The recurrence matches no days")
+    keys = set()
+    for row in rows:
+        key = (row["movie_id"], row["hall_id"], row["start_time"])
+        if key in keys:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Duplicate showtime in batch: movie {key[0]} in hall {key[1]} at {key[2].isoformat()}")
+        keys.add(key)
+    await check_hall_overlaps(db, [(row["hall_id"], row["start_time"], row["end_time"], None) for row in rows])
+
+    created = (await db.scalars(
+        insert(Showtime).values(rows)
+        .on_conflict_do_nothing(constraint="unique_showtime")
+        .returning(Showtime)
+    )).all()
+    if len(created) < len(rows):
+        existing = sorted(keys - {(showtime.movie_id, showtime.hall_id, showtime.start_time)
+                                  for showtime in created})
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Showtimes already exist: " + ", ".join(
+            f"movie {movie_id} in hall {hall_id} at {start_time.isoformat()}"
+            for movie_id, hall_id, start_time in existing[:20]))
+    await db.commit()
+    await _invalidate_showtime_listings(db, *hall_ids)
+    return [ShowtimeResponse(
+        id=showtime.id,
+        movie_id=showtime.movie_id,
+        hall_id=showtime.hall_id,
+        start_time=showtime.start_time,
+        end_time=showtime.end_time,
+        price=showtime.price,
+        movie=MovieResponse.model_validate(movies[showtime.movie_id]),
+    ) for showtime in created]
+
+
+async def update_showtime(showtime_id: int, showtime: ShowtimeCreate, db: AsyncSession):
+    db_showtime = await db.get(Showtime, showtime_id)
     if not db_showtime:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Showtime not found")
+    await check_hall_overlaps(db, [(showtime.hall_id, showtime.start_time, showtime.end_time, showtime_id)])
+    old_hall_id = db_showtime.hall_id
+    moved = old_hall_id != showtime.hall_id
     for key, value in showtime.model_dump().items():
         setattr(db_showtime, key, value)
-    db.commit()
-    db.refresh(db_showtime)
+    if moved:
+        await db.flush()
+        await sync_cinema(db, showtime_id=showtime_id)
+    await db.commit()
+    await db.refresh(db_showtime, ["movie"])
+    seat_inventory.invalidate(showtime_id)
+    await _invalidate_showtime_listings(db, old_hall_id, db_showtime.hall_id)
     return db_showtime
 
 
-def partial_update_showtime(
+async def partial_update_showtime(
     showtime_id: int,
     movie_id: Optional[int],
     hall_id: Optional[int],
-    start_time: Optional[str],
-    end_time: Optional[str],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
     price: Optional[float],
-    db: Session
+    db: AsyncSession
 ):
-    db_showtime = db.query(Showtime).filter(Showtime.id == showtime_id).first()
+    db_showtime = await db.get(Showtime, showtime_id)
     if not db_showtime:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Showtime not found")
+    if (end_time or db_showtime.end_time) <= (start_time or db_showtime.start_time):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="End time must be after start time")
+    old_hall_id = db_showtime.hall_id
     if movie_id is not None:
         db_showtime.movie_id = movie_id
     if hall_id is not None:
@@ -274,18 +435,27 @@ def partial_update_showtime(
         db_showtime.end_time = end_time
     if price is not None:
         db_showtime.price = price
-    db.commit()
-    db.refresh(db_showtime)
+    if hall_id is not None or start_time is not None or end_time is not None:
+        await check_hall_overlaps(db, [(db_showtime.hall_id, db_showtime.start_time,
+                                        db_showtime.end_time, showtime_id)])
+    if hall_id is not None:
+        await db.flush()
+        await sync_cinema(db, showtime_id=showtime_id)
+    await db.commit()
+    await db.refresh(db_showtime, ["movie"])
+    if hall_id is not None:
+        seat_inventory.invalidate(showtime_id)
+    await _invalidate_showtime_listings(db, old_hall_id, db_showtime.hall_id)
     return db_showtime
 
 
-def delete_showtime(showtime_id: int, db: Session):
-    showtime = db.query(Showtime).filter(Showtime.id == showtime_id).first()
+async def delete_showtime(showtime_id: int, db: AsyncSession):
+    showtime = await db.get(Showtime, showtime_id)
     if not showtime:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Showtime not found")
-    dependent_reservations = db.query(Reservation).filter(
-        Reservation.showtime_id == showtime_id).first()
+    dependent_reservations = await db.scalar(select(Reservation).where(
+        Reservation.showtime_id == showtime_id).limit(1))
     if dependent_reservations:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -295,70 +465,354 @@ def delete_showtime(showtime_id: int, db: Session):
         detail="Deletion not allowed; please remove dependent reservations first")
 
 
-def get_users_with_reservations(db: Session) -> List[UserResponse]:
-    users = db.query(User).join(Reservation, User.id ==
-                                Reservation.user_id).distinct().all()
-    if not users:
+def _has_reservation():
+    return select(Reservation.id).where(Reservation.user_id == User.id).exists()
+
+
+async def get_users_with_reservations(
+    cursor: Optional[str],
+    limit: int,
+    db: AsyncSession
+) -> Page[UserResponse]:
+    users = (await db.scalars(keyset(
+        select(User).where(_has_reservation()), [User.id], cursor, limit))).all()
+    if not users and not cursor:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail="No user with reservation found")
-    return users
+    return make_page(users, limit, lambda user: (user.id,))
+
+
+def build_users_export() -> Select:
+    """Query every user with a reservation as plain rows, for the streaming exports."""
+    return select(
+        User.id, User.email, User.full_name, User.phone_number, User.role,
+    ).where(_has_reservation()).order_by(User.id)
 
 
-def get_total_sales(
-    db: Session,
+def _created_between(start_date: Optional[datetime], end_date: Optional[datetime]) -> ColumnElement:
+    condition = true()
+    if start_date:
+        condition = and_(condition, Reservation.created_at >= start_date)
+    if end_date:
+        condition = and_(condition, Reservation.created_at <= end_date)
+    return condition
+
+
+def _split_sales_window(
+    start_date: Optional[datetime], end_date: Optional[datetime]
+) -> Tuple[Optional[Tuple[Optional[date], Optional[date]]], Optional[ColumnElement]]:
+    """
+    Split the window ``[start_date, end_date]`` into whole days and the rest.
+
+    Returns the first and last day lying wholly inside the window (``None``
+    for an open end), to be read from ``sales_rollup``, and a condition
+    selecting the reservations of the partial days at either end. The days
+    are ``None`` when the window holds no whole day and the condition is
+    ``None`` when it has no partial day, so the bounds keep their timestamp
+    meaning.
+    """
+    first_day = last_day = None
+    if start_date:
+        first_day = start_date.date() + timedelta(days=start_date.time() != time.min)
+    if end_date:
+        last_day = (end_date + timedelta(microseconds=1)).date() - timedelta(days=1)
+    if first_day and last_day and first_day > last_day:
+        return None, _created_between(start_date, end_date)
+    edges = []
+    if start_date and start_date.time() != time.min:
+        edges.append(Reservation.created_at < datetime.combine(first_day, time.min))
+    if end_date and (end_date + timedelta(microseconds=1)).time() != time.min:
+        edges.append(Reservation.created_at >= datetime.combine(last_day + timedelta(days=1), time.min))
+    if not edges:
+        return (first_day, last_day), None
+    return (first_day, last_day), and_(_created_between(start_date, end_date), or_(*edges))
+
+
+async def get_total_sales(
+    db: AsyncSession,
     cinema_id: Optional[int] = None,
     showtime_id: Optional[int] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None
 ) -> dict:
-    query = db.query(func.sum(Reservation.price)).filter(
-        Reservation.status == Status.CONFIRMED
-    )
-    if cinema_id:
-        query = query.join(Showtime, Reservation.showtime_id == Showtime.id
-                           ).join(Hall, Showtime.hall_id == Hall.id
-                                  ).filter(Hall.cinema_id == cinema_id)
-        if not db.query(Cinema).filter(Cinema.id == cinema_id).first():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
-    if showtime_id:
-        query = query.filter(Reservation.showtime_id == showtime_id)
-        if not db.query(Showtime).filter(Showtime.id == showtime_id).first():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Showtime not found")
-    if start_date:
-        query = query.filter(Reservation.created_at >= start_date)
-    if end_date:
-        query = query.filter(Reservation.created_at <= end_date)
-    total = query.scalar() or 0.0
+    """
+    Sum confirmed sales created between ``start_date`` and ``end_date`` (inclusive).
+
+    Days the range covers completely are read from the ``sales_rollup``
+    table; the partial days at either end are summed from the confirmed
+    reservations themselves, so the bounds keep their timestamp meaning.
+    """
+    if cinema_id and not await db.get(Cinema, cinema_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
+    if showtime_id and not await db.get(Showtime, showtime_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Showtime not found")
+
+    whole_days, partial_days = _split_sales_window(start_date, end_date)
+    total = 0
+    if whole_days:
+        first_day, last_day = whole_days
+        query = select(func.sum(SalesRollup.total_amount))
+        if cinema_id:
+            query = query.where(SalesRollup.cinema_id == cinema_id)
+        if showtime_id:
+            query = query.where(SalesRollup.showtime_id == showtime_id)
+        if first_day:
+            query = query.where(SalesRollup.day >= first_day)
+        if last_day:
+            query = query.where(SalesRollup.day <= last_day)
+        total += await db.scalar(query) or 0
+    if partial_days is not None:
+        query = select(func.sum(Reservation.price)).where(
+            Reservation.status == Status.CONFIRMED, partial_days)
+        if cinema_id:
+            query = query.join(Showtime, Reservation.showtime_id == Showtime.id).join(
+                Hall, Showtime.hall_id == Hall.id).where(Hall.cinema_id == cinema_id)
+        if showtime_id:
+            query = query.where(Reservation.showtime_id == showtime_id)
+        total += await db.scalar(query) or 0
     return {"total_sales": float(total)}
 
 
-def approve_reservation(reservation_id: int, db: Session) -> ReservationResponse:
-    reservation = db.query(Reservation).filter(
-        Reservation.id == reservation_id).first()
+def _confirmed_sales(condition: ColumnElement) -> Select:
+    return select(
+        Hall.cinema_id, Reservation.showtime_id, Reservation.created_at.label("sold_at"),
+        Reservation.price.label("amount"), literal(1).label("tickets"),
+    ).join(Showtime, Reservation.showtime_id == Showtime.id).join(
+        Hall, Showtime.hall_id == Hall.id
+    ).where(Reservation.status == Status.CONFIRMED, condition)
+
+
+async def build_sales_breakdown(
+    db: AsyncSession,
+    group_by: List[SalesGroup],
+    cinema_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Select:
+    """
+    Build one ``GROUP BY`` query of revenue and tickets per requested dimension.
+
+    Daily and coarser reports read the days the window covers completely
+    from the ``sales_rollup`` table and the partial days at either end from
+    the confirmed reservations, like :func:`get_total_sales`; grouping by
+    hour needs the reservation timestamps and aggregates confirmed
+    reservations throughout.
+
+    Raises:
+        HTTPException (404): If ``cinema_id`` does not match a cinema.
+    """
+    if cinema_id and not await db.get(Cinema, cinema_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
+    group_by = list(dict.fromkeys(group_by))
+    if SalesGroup.HOUR in group_by:
+        sources = [_confirmed_sales(_created_between(start_date, end_date))]
+    else:
+        whole_days, partial_days = _split_sales_window(start_date, end_date)
+        sources = []
+        if whole_days:
+            first_day, last_day = whole_days
+            rollup = select(
+                SalesRollup.cinema_id, SalesRollup.showtime_id,
+                cast(SalesRollup.day, DateTime).label("sold_at"),
+                SalesRollup.total_amount.label("amount"),
+                SalesRollup.ticket_count.label("tickets"),
+            )
+            if first_day:
+                rollup = rollup.where(SalesRollup.day >= first_day)
+            if last_day:
+                rollup = rollup.where(SalesRollup.day <= last_day)
+            sources.append(rollup)
+        if partial_days is not None:
+            sources.append(_confirmed_sales(partial_days))
+    if cinema_id:
+        sources = [source.where(source.selected_columns.cinema_id == cinema_id) for source in sources]
+    sales = (sources[0] if len(sources) == 1 else union_all(*sources)).subquery("sales")
+
+    dimensions = {
+        SalesGroup.CINEMA: sales.c.cinema_id,
+        SalesGroup.HALL: Showtime.hall_id.label("hall_id"),
+        SalesGroup.MOVIE: Showtime.movie_id.label("movie_id"),
+        SalesGroup.SHOWTIME: sales.c.showtime_id,
+        SalesGroup.HOUR: func.date_trunc("hour", sales.c.sold_at).label("hour"),
+        SalesGroup.DAY: func.date_trunc("day", sales.c.sold_at).label("day"),
+        SalesGroup.WEEK: func.date_trunc("week", sales.c.sold_at).label("week"),
+    }
+    keys = [dimensions[group] for group in group_by]
+    query = select(
+        *keys,
+        func.sum(sales.c.amount).label("revenue"),
+        func.sum(sales.c.tickets).label("tickets"),
+    )
+    if SalesGroup.HALL in group_by or SalesGroup.MOVIE in group_by:
+        query = query.join_from(sales, Showtime, sales.c.showtime_id == Showtime.id)
+    return query.group_by(*keys).order_by(*keys)
+
+
+async def get_sales_breakdown(query: Select, db: AsyncSession) -> List[dict]:
+    return [
+        {**row._asdict(), "revenue": float(row.revenue or 0), "tickets": int(row.tickets or 0)}
+        for row in await db.execute(query)
+    ]
+
+
+async def approve_reservation(reservation_id: int, db: AsyncSession) -> ReservationResponse:
+    # The row lock keeps the hold reaper from deleting it underneath us
+    reservation = await db.get(Reservation, reservation_id, with_for_update=True)
     if not reservation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
     if reservation.status == Status.CONFIRMED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Reservation already confirmed")
+    if reservation.status == Status.CANCELED:
+        # The seat may have been held by someone else since the cancellation
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Reservation is canceled")
+    if reservation.status == Status.PENDING and reservation.expires_at is not None and (
+            reservation.expires_at <= await db.scalar(select(func.localtimestamp()))):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Reservation hold has expired")
+    old_status = reservation.status
     reservation.status = Status.CONFIRMED
-    db.commit()
-    db.refresh(reservation)
+    reservation.expires_at = None
+    await record_sale(reservation, 1, db)
+    await db.commit()
+    await db.refresh(reservation)
+    seat_inventory.update(reservation.showtime_id,
+                          reservation.seat_number, old_status, reservation.status)
     return reservation
 
 
-def reject_reservation(reservation_id: int, db: Session) -> ReservationResponse:
-    reservation = db.query(Reservation).filter(
-        Reservation.id == reservation_id).first()
+async def reject_reservation(reservation_id: int, db: AsyncSession) -> ReservationResponse:
+    reservation = await db.get(Reservation, reservation_id, with_for_update=True)
     if not reservation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
     if reservation.status == Status.CANCELED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Reservation already canceled")
+    old_status = reservation.status
     reservation.status = Status.CANCELED
-    db.commit()
-    db.refresh(reservation)
+    reservation.expires_at = None
+    if old_status == Status.CONFIRMED:
+        await record_sale(reservation, -1, db)
+    await db.commit()
+    await db.refresh(reservation)
+    seat_inventory.update(reservation.showtime_id,
+                          reservation.seat_number, old_status, reservation.status)
     return reservation
+
+
+async def _bulk_transition(
+    selection: ReservationBulkUpdate,
+    from_statuses: List[Status],
+    new_status: Status,
+    db: AsyncSession
+) -> ReservationBulkResult:
+    """
+    Move the selected reservations in ``from_statuses`` to ``new_status``.
+
+    The rows are locked and updated by a single ``UPDATE … FROM … RETURNING``
+    that also returns each row's previous status, so the sales rollup and
+    the seat inventory are adjusted without reloading anything.
+    """
+    # The showtime and age filters of the selection
+    matched = true()
+    if selection.showtime_id is not None:
+        matched = and_(matched, Reservation.showtime_id == selection.showtime_id)
+    if selection.older_than_minutes is not None:
+        matched = and_(matched, Reservation.created_at <= func.localtimestamp() - timedelta(
+            minutes=selection.older_than_minutes))
+    expired = and_(Reservation.expires_at.is_not(None), Reservation.expires_at <= func.localtimestamp())
+    candidates = select(Reservation.id, Reservation.status).where(
+        Reservation.status.in_(from_statuses), matched)
+    if new_status == Status.CONFIRMED:
+        candidates = candidates.where(~expired)
+    if selection.ids is not None:
+        candidates = candidates.where(Reservation.id.in_(selection.ids))
+    # The row locks keep the hold reaper and single approvals off these rows
+    previous = candidates.order_by(Reservation.id).limit(
+        MAX_BULK_RESERVATIONS).with_for_update().subquery()
+    changed = (await db.execute(
+        update(Reservation)
+        .values(status=new_status, expires_at=None)
+        .where(Reservation.id == previous.c.id)
+        .returning(Reservation.id, Reservation.showtime_id, Reservation.seat_number,
+                   Reservation.price, Reservation.created_at, previous.c.status)
+        .execution_options(synchronize_session=False)
+    )).all()
+    if new_status == Status.CONFIRMED:
+        await record_sales([(row.showtime_id, row.created_at, row.price) for row in changed], 1, db)
+    else:
+        await record_sales([(row.showtime_id, row.created_at, row.price) for row in changed
+                            if row.status == Status.CONFIRMED], -1, db)
+
+    results = [ReservationBulkOutcome(id=row.id, outcome=BulkOutcome.UPDATED, status=new_status)
+               for row in changed]
+    if selection.ids is not None:
+        untouched = set(selection.ids) - {row.id for row in changed}
+        found = {row.id: row for row in await db.execute(
+            select(Reservation.id, Reservation.status, matched.label("matched"), expired.label("expired"))
+            .where(Reservation.id.in_(untouched)))}
+        for reservation_id in sorted(untouched):
+            row = found.get(reservation_id)
+            if row is None:
+                outcome = BulkOutcome.NOT_FOUND
+            elif row.status not in from_statuses:
+                outcome = BulkOutcome.UNCHANGED
+            elif not row.matched:
+                outcome = BulkOutcome.NOT_MATCHED
+            elif new_status == Status.CONFIRMED and row.expired:
+                outcome = BulkOutcome.EXPIRED
+            else:
+                outcome = BulkOutcome.UNCHANGED
+            results.append(ReservationBulkOutcome(
+                id=reservation_id, outcome=outcome, status=row.status if row else None))
+    await db.commit()
+    for row in changed:
+        seat_inventory.update(row.showtime_id, row.seat_number, Status(row.status), new_status)
+    return ReservationBulkResult(
+        updated=len(changed),
+        results=results,
+        has_more=selection.ids is None and len(changed) == MAX_BULK_RESERVATIONS,
+    )
+
+
+async def approve_reservations(selection: ReservationBulkUpdate, db: AsyncSession) -> ReservationBulkResult:
+    """
+    Confirm the selected PENDING reservations whose hold has not expired.
+
+    Canceled reservations are left alone, as in the single approval: their
+    seat may have been taken since.
+    """
+    return await _bulk_transition(selection, [Status.PENDING], Status.CONFIRMED, db)
+
+
+async def reject_reservations(selection: ReservationBulkUpdate, db: AsyncSession) -> ReservationBulkResult:
+    """Cancel the selected PENDING and CONFIRMED reservations."""
+    return await _bulk_transition(selection, [Status.PENDING, Status.CONFIRMED], Status.CANCELED, db)
+
+
+def get_db_pool_status() -> dict:
+    """Return connection pool occupancy and checkout statistics for this worker."""
+    pool_status = pool_stats.snapshot(engine.pool)
+    pool_status["max_overflow"] = settings.DB_MAX_OVERFLOW
+    return pool_status
+
+
+def get_auth_cache_status() -> dict:
+    """Return size and hit/miss counters of this worker's authenticated-user cache."""
+    return user_cache.stats()
+
+
+def get_response_cache_status() -> dict:
+    """Return size and hit/miss counters of this worker's catalog response cache."""
+    return response_cache.stats()
+
+
+def get_seat_stream_status() -> dict:
+    """Return how many seat availability streams this worker is serving."""
+    return seat_events.stats()
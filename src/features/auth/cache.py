@@ -0,0 +1,107 @@
+"""In-process cache of authenticated user identities.
+
+``get_current_user`` resolves the token subject (the user's email) through
+:data:`user_cache` before falling back to the database. Entries expire after
+``AUTH_USER_CACHE_TTL`` seconds, the cache holds at most
+``AUTH_USER_CACHE_SIZE`` users (least recently used are evicted first), and
+any ORM update or delete of a ``User`` drops its entry. A user loaded while
+an entry was being dropped is not cached, as it may predate the change.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from sqlalchemy import event, inspect
+from src.config.settings import settings
+from src.features.users.models import User
+
+# Columns copied into the cache; the password hash is deliberately left out.
+_CACHED_FIELDS = ("id", "email", "role", "full_name",
+                  "phone_number", "created_at")
+
+
+class UserCache:
+    """Bounded, TTL-based cache of user records keyed by email."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        # Bumped by every invalidation
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, email: str) -> Optional[User]:
+        """Return a detached copy of the cached user, or ``None`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[email]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(email)
+            self.hits += 1
+            fields = entry[1]
+        return User(**fields)
+
+    def put(self, user: User, generation: int) -> None:
+        """
+        Cache ``user``.
+
+        ``generation`` is the value of :attr:`generation` read before the
+        user was loaded; if any entry was dropped since, the user is not
+        cached.
+        """
+        if self.max_size <= 0:
+            return
+        fields = {name: getattr(user, name) for name in _CACHED_FIELDS}
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[user.email] = (time.monotonic() + self.ttl, fields)
+            self._entries.move_to_end(user.email)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, email: str) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(email, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE,
+                       settings.AUTH_USER_CACHE_TTL)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target: User) -> None:
+    history = inspect(target).attrs.email.history
+    for email in (*history.deleted, target.email):
+        if email is not None:
+            user_cache.invalidate(email)
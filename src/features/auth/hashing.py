@@ -0,0 +1,53 @@
+"""Password hashing off the event loop.
+
+bcrypt is deliberately slow and CPU bound, so hashes are computed on a small
+dedicated thread pool (bcrypt releases the GIL while it works). The number of
+jobs queued or running is capped; beyond the cap callers get ``429 Too Many
+Requests`` instead of waiting in an ever-growing queue.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from fastapi import HTTPException, status
+from src.config.settings import settings
+
+
+class PasswordHasher:
+    """Runs bcrypt hash and verify calls on a bounded thread pool."""
+
+    def __init__(self, rounds: int, workers: int, max_pending: int):
+        self.rounds = rounds
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash")
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run(
+            bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt(self.rounds))
+        return hashed.decode("utf-8")
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            bcrypt.checkpw, plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+    async def _run(self, func, *args):
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many authentication requests, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
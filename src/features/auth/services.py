@@ -1,18 +1,20 @@
 from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
-import bcrypt
 from src.features.users.models import User
 from src.features.users.schemas import UserCreate, Role
 from src.config.settings import settings
 from src.database import get_db
+from .cache import user_cache
+from .hashing import password_hasher
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid token",
@@ -23,20 +25,24 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         email: str | None = payload.get("sub")
         if email is None:
             raise credentials_exception
-        user = db.query(User).filter(User.email == email).first()
+        user = user_cache.get(email)
         if user is None:
-            raise credentials_exception
+            generation = user_cache.generation
+            user = await db.scalar(select(User).where(User.email == email))
+            if user is None:
+                raise credentials_exception
+            user_cache.put(user, generation)
         return user
     except JWTError as exc:
         raise credentials_exception from exc
 
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
 
 
 def create_access_token(data: dict) -> str:
@@ -46,27 +52,27 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
 
 
-def register_user(user: UserCreate, db: Session):
-    existing_user = db.query(User).filter(User.email == user.email).first()
+async def register_user(user: UserCreate, db: AsyncSession):
+    existing_user = await db.scalar(select(User).where(User.email == user.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
     db_user = User(
         email=user.email,
-        password_hash=hash_password(user.password),
+        password_hash=await hash_password(user.password),
         role=user.role if user.role else Role.USER,
         full_name=user.full_name,
         phone_number=user.phone_number
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return {"message": f"User with id {db_user.id} created successfully"}
 
 
-def login_user(form_data: OAuth2PasswordRequestForm, db: Session):
-    db_user = db.query(User).filter(User.email == form_data.username).first()
-    if not db_user or not verify_password(form_data.password, db_user.password_hash):
+async def login_user(form_data: OAuth2PasswordRequestForm, db: AsyncSession):
+    db_user = await db.scalar(select(User).where(User.email == form_data.username))
+    if not db_user or not await verify_password(form_data.password, db_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     access_token = create_access_token(
@@ -1,30 +1,54 @@
 import logging
-from typing import List
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Request
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.features.hall.schemas import HallResponse
 from src.features.showtime.schemas import ShowtimeResponse
 from src.database import get_db
+from src.utils.response_cache import response_cache
 from .services import get_cinemas, get_cinema_halls, get_cinema_showtimes
+from src.utils.pagination import Page, cursor_query, limit_query
 from .schemas import CinemaResponse
 
 router = APIRouter(tags=["cinema"])
 logger = logging.getLogger(__name__)
 
+_cinema_page = TypeAdapter(Page[CinemaResponse])
+_hall_list = TypeAdapter(List[HallResponse])
+_showtime_page = TypeAdapter(Page[ShowtimeResponse])
 
-@router.get("/", response_model=List[CinemaResponse])
-async def get_cinemas_endpoint(db: Session = Depends(get_db)):
+
+@router.get("/", response_model=Page[CinemaResponse])
+async def get_cinemas_endpoint(
+    request: Request,
+    cursor: Optional[str] = cursor_query,
+    limit: int = limit_query(),
+    db: AsyncSession = Depends(get_db)
+):
     logger.info("Fetching all cinemas")
-    return get_cinemas(db)
+    return await response_cache.respond(
+        request, _cinema_page, lambda: get_cinemas(cursor, limit, db), lambda page: ["cinemas"])
 
 
 @router.get("/{cinema_id}/halls", response_model=List[HallResponse])
-async def get_cinema_halls_endpoint(cinema_id: int, db: Session = Depends(get_db)):
+async def get_cinema_halls_endpoint(cinema_id: int, request: Request, db: AsyncSession = Depends(get_db)):
     logger.info(f"Fetching halls for cinema ID: {cinema_id}")
-    return get_cinema_halls(cinema_id, db)
+    return await response_cache.respond(
+        request, _hall_list, lambda: get_cinema_halls(cinema_id, db),
+        lambda halls: [f"cinema:{cinema_id}:halls"])
 
 
-@router.get("/{cinema_id}/showtimes", response_model=List[ShowtimeResponse])
-async def get_cinema_showtimes_endpoint(cinema_id: int, db: Session = Depends(get_db)):
+@router.get("/{cinema_id}/showtimes", response_model=Page[ShowtimeResponse])
+async def get_cinema_showtimes_endpoint(
+    cinema_id: int,
+    request: Request,
+    cursor: Optional[str] = cursor_query,
+    limit: int = limit_query(),
+    db: AsyncSession = Depends(get_db)
+):
     logger.info(f"Fetching showtimes for cinema ID: {cinema_id}")
-    return get_cinema_showtimes(cinema_id, db)
+    return await response_cache.respond(
+        request, _showtime_page, lambda: get_cinema_showtimes(cinema_id, cursor, limit, db),
+        lambda page: [f"cinema:{cinema_id}:showtimes",
+                      *(f"movie:{s.movie_id}" for s in page.items)])
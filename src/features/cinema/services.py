@@ -1,41 +1,46 @@
-from typing import List
+from typing import List, Optional
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from src.features.hall.models import Hall
 from src.features.showtime.models import Showtime
-from src.features.movie.models import Movie
+from src.utils.pagination import Page, keyset, make_page
 from .models import Cinema
 from .schemas import CinemaResponse
 
 
-def get_cinemas(db: Session) -> List[CinemaResponse]:
-    cinemas = db.query(Cinema).all()
-    if not cinemas:
+async def get_cinemas(cursor: Optional[str], limit: int, db: AsyncSession) -> Page[CinemaResponse]:
+    cinemas = (await db.scalars(keyset(select(Cinema), [Cinema.id], cursor, limit))).all()
+    if not cinemas and not cursor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="No cinemas found")
-    return cinemas
+    return make_page(cinemas, limit, lambda cinema: (cinema.id,))
 
 
-def get_cinema_halls(cinema_id: int, db: Session):
-    cinema = db.query(Cinema).filter(Cinema.id == cinema_id).first()
+async def get_cinema_halls(cinema_id: int, db: AsyncSession):
+    cinema = await db.get(Cinema, cinema_id)
     if not cinema:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
-    halls = db.query(Hall).filter(Hall.cinema_id == cinema_id).all()
+    halls = (await db.scalars(select(Hall).where(Hall.cinema_id == cinema_id))).all()
     if not halls:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail="No halls found for this cinema")
     return halls
 
 
-def get_cinema_showtimes(cinema_id: int, db: Session):
-    cinema = db.query(Cinema).filter(Cinema.id == cinema_id).first()
+async def get_cinema_showtimes(cinema_id: int, cursor: Optional[str], limit: int, db: AsyncSession) -> Page:
+    cinema = await db.get(Cinema, cinema_id)
     if not cinema:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
-    showtimes = db.query(Showtime).join(Hall).filter(
-        Hall.cinema_id == cinema_id).join(Movie).all()
-    if not showtimes:
+    showtimes = (await db.scalars(keyset(
+        select(Showtime).join(Hall).where(Hall.cinema_id == cinema_id)
+        .options(joinedload(Showtime.movie, innerjoin=True)),
+        [Showtime.start_time, Showtime.id], cursor, limit,
+    ))).all()
+    if not showtimes and not cursor:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail="No showtimes found for this cinema")
-    return showtimes
+    return make_page(showtimes, limit, lambda showtime: (showtime.start_time, showtime.id))
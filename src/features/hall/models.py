@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from src.database import Base
 
@@ -12,3 +12,7 @@ class Hall(Base):
     columns = Column(Integer, nullable=False)
     cinema = relationship("Cinema", back_populates="hall")
     showtime = relationship("Showtime", back_populates="hall")
+
+    __table_args__ = (
+        Index('ix_hall_cinema_id', 'cinema_id'),
+    )
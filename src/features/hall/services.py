@@ -1,49 +1,57 @@
 from datetime import datetime, timezone
-from typing import List
+from typing import Dict, List
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.features.cinema.models import Cinema
+from src.features.movie.models import Movie
+from src.features.movie.schemas import MovieResponse
+from src.features.showtime.models import Showtime
+from src.features.showtime.schemas import ShowtimeResponse
 from .models import Hall
 from .schemas import HallResponse
 
 
-def get_hall_with_showtimes(cinema_id: int, db: Session) -> List[HallResponse]:
-    cinema = db.query(Cinema).filter(Cinema.id == cinema_id).first()
-    if not cinema:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
-    halls = db.query(Hall).filter(Hall.cinema_id == cinema_id).all()
-    if not halls:
+async def get_hall_with_showtimes(cinema_id: int, db: AsyncSession) -> List[HallResponse]:
+    # start_time is stored as naive UTC
+    current_time = datetime.now(timezone.utc).replace(tzinfo=None)
+    # Every hall of the cinema with its upcoming showtimes and their movies,
+    # in one query; halls without upcoming showtimes come back once with NULLs.
+    rows = (await db.execute(
+        select(Hall, Showtime, Movie)
+        .outerjoin(Showtime, and_(Showtime.hall_id == Hall.id,
+                                  Showtime.start_time >= current_time))
+        .outerjoin(Movie, Showtime.movie_id == Movie.id)
+        .where(Hall.cinema_id == cinema_id)
+        .order_by(Hall.id, Showtime.start_time)
+    )).all()
+    if not rows:
+        cinema = await db.get(Cinema, cinema_id)
+        if not cinema:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail="No hall found for this cinema")
-    result = []
-    current_time = datetime.now(timezone.utc)
-    for hall in halls:
-        showtimes = db.query(Showtime).filter(
-            Showtime.hall_id == hall.id,
-            Showtime.start_time >= current_time
-        ).all()
-        hall_data = HallResponse(
-            id=hall.id,
-            name=hall.name,
-            rows=hall.rows,
-            columns=hall.columns,
-            cinema_id=hall.cinema_id,
-            showtimes=[
-                ShowtimeResponse(
-                    id=showtime.id,
-                    movie_id=showtime.movie_id,
-                    hall_id=showtime.hall_id,
-                    start_time=showtime.start_time,
-                    end_time=showtime.end_time,
-                    price=showtime.price,
-                    movie={
-                        "id": showtime.movie.id,
-                        "title": showtime.movie.title
-                    }
-                )
-                for showtime in showtimes
-            ]
-        )
-        result.append(hall_data)
-    return result
+    result: Dict[int, HallResponse] = {}
+    for hall, showtime, movie in rows:
+        hall_data = result.get(hall.id)
+        if hall_data is None:
+            hall_data = result[hall.id] = HallResponse(
+                id=hall.id,
+                name=hall.name,
+                rows=hall.rows,
+                columns=hall.columns,
+                cinema_id=hall.cinema_id,
+                showtimes=[]
+            )
+        if showtime is not None:
+            hall_data.showtimes.append(ShowtimeResponse(
+                id=showtime.id,
+                movie_id=showtime.movie_id,
+                hall_id=showtime.hall_id,
+                start_time=showtime.start_time,
+                end_time=showtime.end_time,
+                price=showtime.price,
+                movie=MovieResponse.model_validate(movie)
+            ))
+    return list(result.values())
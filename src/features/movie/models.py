@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from src.database import Base
 
@@ -15,3 +15,7 @@ class Movie(Base):
     showtime = relationship("Showtime", back_populates="movie")
     genre = relationship("Genre", back_populates="movies",
                          foreign_keys=[genre_id])
+
+    __table_args__ = (
+        Index('ix_movie_genre_id_release_date', 'genre_id', 'release_date'),
+    )
@@ -1,22 +1,34 @@
 import logging
 from datetime import date
-from typing import Optional, List
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, Request
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.database import get_db
+from src.utils.response_cache import response_cache
 from .services import get_movies
+from src.utils.pagination import Page, cursor_query, limit_query
 from .schemas import MovieResponse
 
 router = APIRouter(tags=["movie"])
 logger = logging.getLogger(__name__)
 
+_movie_page = TypeAdapter(Page[MovieResponse])
 
-@router.get("/", response_model=List[MovieResponse])
+
+@router.get("/", response_model=Page[MovieResponse])
 async def get_movies_endpoint(
+    request: Request,
     genre_id: Optional[int] = None,
     release_date_gte: Optional[date] = None,
     release_date_lte: Optional[date] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = cursor_query,
+    limit: int = limit_query(),
+    db: AsyncSession = Depends(get_db)
 ):
-    {release_date_gte}, release_date_lte = {release_date_lte}")
-    return get_movies(genre_id, release_date_gte, release_date_lte, db)
+    logger.info(
+        f"Fetching movies with filters: genre_id={genre_id}, release_date_gte={release_date_gte}, release_date_lte={release_date_lte}")
+    return await response_cache.respond(
+        request, _movie_page,
+        lambda: get_movies(genre_id, release_date_gte, release_date_lte, cursor, limit, db),
+        lambda movies: ["movies"])
@@ -1,15 +1,25 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from .models import Movie
 from datetime import date
 from typing import Optional
+from src.utils.pagination import Page, keyset, make_page
 
 
-def get_movies(genre_id: Optional[int], release_date_gte: Optional[date], release_date_lte: Optional[date], db: Session):
-    query = db.query(Movie)
+async def get_movies(
+    genre_id: Optional[int],
+    release_date_gte: Optional[date],
+    release_date_lte: Optional[date],
+    cursor: Optional[str],
+    limit: int,
+    db: AsyncSession
+) -> Page:
+    query = select(Movie)
     if genre_id:
-        query = query.filter(Movie.genre_id == genre_id)
+        query = query.where(Movie.genre_id == genre_id)
     if release_date_gte:
-        query = query.filter(Movie.release_date >= release_date_gte)
+        query = query.where(Movie.release_date >= release_date_gte)
     if release_date_lte:
-        query = query.filter(Movie.release_date <= release_date_lte)
-    return query.all()
+        query = query.where(Movie.release_date <= release_date_lte)
+    movies = (await db.scalars(keyset(query, [Movie.id], cursor, limit))).all()
+    return make_page(movies, limit, lambda movie: (movie.id,))
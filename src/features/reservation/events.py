@@ -0,0 +1,73 @@
+"""In-process fan-out of seat changes to streaming subscribers.
+
+:data:`seat_events` keeps one bounded ``asyncio.Queue`` per subscriber,
+grouped by showtime. The seat inventory publishes a change once, already
+encoded as a server-sent event, and the same bytes are queued for every
+subscriber, so a change costs one ``put_nowait`` per listener. A subscriber
+that falls ``SEAT_STREAM_QUEUE_SIZE`` events behind has its backlog replaced
+by a single :data:`RESYNC` marker and is sent a fresh snapshot instead.
+
+Publishing must happen on the event loop thread, which is where the
+services update the inventory. Like the inventory itself, subscriptions are
+per worker process.
+"""
+
+import asyncio
+import json
+from typing import Dict, NamedTuple, Set
+from src.config.settings import settings
+
+# Queued in place of events a subscriber can no longer be sent in order.
+RESYNC = object()
+
+
+class SeatEvent(NamedTuple):
+    seed: int
+    version: int
+    message: str
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class SeatEventHub:
+    """Registry of subscriber queues keyed by showtime ID."""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+
+    def subscribe(self, showtime_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(showtime_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, showtime_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(showtime_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[showtime_id]
+
+    def has_subscribers(self, showtime_id: int) -> bool:
+        return showtime_id in self._subscribers
+
+    def publish(self, showtime_id: int, item) -> None:
+        """Queue ``item`` (a :class:`SeatEvent` or :data:`RESYNC`) for every subscriber."""
+        for queue in self._subscribers.get(showtime_id, ()):
+            try:
+                queue.put_nowait(item)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+
+    def stats(self) -> dict:
+        return {
+            "showtimes": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+        }
+
+
+seat_events = SeatEventHub(settings.SEAT_STREAM_QUEUE_SIZE)
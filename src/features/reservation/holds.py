@@ -0,0 +1,54 @@
+"""Expiry of seat holds.
+
+A PENDING reservation holds its seat until ``expires_at``. The reaper started
+by the application lifespan deletes lapsed holds every
+``SEAT_HOLD_REAP_INTERVAL`` seconds, ``SEAT_HOLD_REAP_BATCH`` rows per
+transaction, and frees their seats in the inventory. Rows are claimed with
+``FOR UPDATE SKIP LOCKED``, so several workers can reap side by side and a
+hold being approved or rejected at the same moment is left alone.
+"""
+
+import asyncio
+import logging
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.config.settings import settings
+from src.database import SessionLocal
+from .models import Reservation
+from .schemas import Status
+from .inventory import seat_inventory
+
+logger = logging.getLogger(__name__)
+
+
+async def reap_expired_holds(db: AsyncSession, batch_size: int) -> int:
+    """Delete lapsed holds in batches of ``batch_size``; return how many were removed."""
+    removed = 0
+    while True:
+        expired = select(Reservation.id).where(
+            Reservation.status == Status.PENDING,
+            Reservation.expires_at <= func.localtimestamp(),
+        ).order_by(Reservation.expires_at).limit(batch_size).with_for_update(skip_locked=True)
+        rows = (await db.execute(
+            delete(Reservation).where(Reservation.id.in_(expired.scalar_subquery()))
+            .returning(Reservation.showtime_id, Reservation.seat_number)
+        )).all()
+        await db.commit()
+        for showtime_id, seat_number in rows:
+            seat_inventory.update(showtime_id, seat_number, Status.PENDING, None)
+        removed += len(rows)
+        if len(rows) < batch_size:
+            return removed
+
+
+async def run_hold_reaper() -> None:
+    """Reap expired holds forever; meant to run as a background task."""
+    while True:
+        try:
+            async with SessionLocal() as db:
+                removed = await reap_expired_holds(db, settings.SEAT_HOLD_REAP_BATCH)
+            if removed:
+                logger.info(f"Released {removed} expired seat holds")
+        except Exception:
+            logger.exception("Seat hold reaper failed")
+        await asyncio.sleep(settings.SEAT_HOLD_REAP_INTERVAL)
@@ -0,0 +1,397 @@
+"""In-memory seat inventory kept per showtime.
+
+Each showtime's occupancy is stored as one integer bitmask per hall row
+(bit ``c`` of row ``r`` set means seat ``r``/``c`` is taken). A map is seeded
+from the database the first time a showtime is requested and is then kept
+current by the reservation and admin services every time a seat changes
+state, so availability is answered without loading reservation rows. Seats
+changed elsewhere (by another worker, or in the database directly) are
+picked up when the map is re-read, ``SEAT_INVENTORY_TTL`` seconds after it
+was loaded; only the ``SEAT_INVENTORY_SIZE`` most recently used maps are kept.
+
+The inventory lives in the worker process; every worker seeds and maintains
+its own copy. It is only used from the event loop and no method awaits in
+the middle of a change, so it needs no lock. Concurrent requests for a
+showtime that is not seeded yet wait for the first one to seed it instead of
+each reading the reservations. Every change to a seeded map is also
+published to :data:`~.events.seat_events` for streaming subscribers.
+"""
+
+import asyncio
+import itertools
+import math
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.config.settings import settings
+from src.features.showtime.models import Showtime
+from src.features.hall.models import Hall
+from src.utils.etag import PROCESS_EPOCH
+from .models import Reservation
+from .schemas import Status
+from .events import RESYNC, SeatEvent, format_sse, seat_events
+
+# Reservation statuses that make a seat unavailable to other buyers; a
+# PENDING reservation holds its seat until it is decided or expires.
+TAKEN_STATUSES = frozenset({Status.PENDING, Status.CONFIRMED})
+
+# Numbers each seeded map, so a re-seeded showtime never reuses an ETag.
+_seeds = itertools.count(1)
+
+
+def seat_label(row: int, column: int) -> str:
+    """Return the seat label for zero-based ``row`` and ``column`` (e.g. ``A1``)."""
+    return f"{chr(ord('A') + row)}{column + 1}"
+
+
+def parse_seat_number(seat_number: str) -> Tuple[int, int]:
+    """
+    Parse a seat label into zero-based ``(row, column)`` indexes.
+
+    Raises:
+        HTTPException (400): If the label is not a row letter followed by a number.
+    """
+    try:
+        seat_number = seat_number.upper()
+        row = ord(seat_number[0]) - ord('A')
+        column = int(seat_number[1:]) - 1
+    except (ValueError, IndexError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Invalid seat number format") from exc
+    return row, column
+
+
+@lru_cache(maxsize=256)
+def _row_labels(rows: int, columns: int) -> Tuple[Tuple[str, ...], ...]:
+    return tuple(
+        tuple(seat_label(row, column) for column in range(columns))
+        for row in range(rows)
+    )
+
+
+class SeatMap:
+    """Occupancy bitmasks for a single showtime."""
+
+    __slots__ = ("hall_id", "rows", "columns", "taken", "seed", "version", "loaded_at", "_available")
+
+    def __init__(self, hall_id: int, rows: int, columns: int):
+        self.seed = next(_seeds)
+        self.loaded_at = time.monotonic()
+        self.hall_id = hall_id
+        self.rows = rows
+        self.columns = columns
+        self.taken: List[int] = [0] * rows
+        self.version = 0
+        self._available: Optional[List[str]] = None
+
+    @property
+    def etag(self) -> str:
+        """Strong ETag for the current occupancy; changes with every seat change."""
+        return f'"{PROCESS_EPOCH}-{self.seed}-{self.version}"'
+
+    def contains(self, row: int, column: int) -> bool:
+        return 0 <= row < self.rows and 0 <= column < self.columns
+
+    def is_taken(self, row: int, column: int) -> bool:
+        return bool(self.taken[row] >> column & 1)
+
+    def set_taken(self, row: int, column: int, taken: bool) -> bool:
+        """Set the state of one seat; return ``True`` if it changed."""
+        if not self.contains(row, column) or self.is_taken(row, column) == taken:
+            return False
+        self.taken[row] ^= 1 << column
+        self.version += 1
+        self._available = None
+        return True
+
+    def best_block(self, size: int) -> Optional[Tuple[int, int]]:
+        """
+        Return ``(row, first_column)`` of the best ``size`` adjacent free seats.
+
+        Blocks closer to the middle row and centered in their row score
+        better. Each row is searched with a handful of bitmask operations:
+        after folding the row's free mask onto itself, bit ``c`` is set when
+        seats ``c`` to ``c + size - 1`` are all free, and the start nearest
+        the centered position is read off the set bits around it.
+        """
+        if size < 1 or size > self.columns:
+            return None
+        full = (1 << self.columns) - 1
+        centered = (self.columns - size) / 2
+        middle_row = (self.rows - 1) / 2
+        below, above = math.floor(centered), math.ceil(centered)
+        best = None
+        for row, mask in enumerate(self.taken):
+            starts = full & ~mask
+            span = 1
+            while span < size and starts:
+                shift = min(span, size - span)
+                starts &= starts >> shift
+                span += shift
+            if not starts:
+                continue
+            candidates = []
+            left = starts & ((1 << below + 1) - 1)
+            if left:
+                candidates.append(left.bit_length() - 1)
+            right = starts >> above << above
+            if right:
+                candidates.append((right & -right).bit_length() - 1)
+            for column in candidates:
+                score = (abs(row - middle_row) + abs(column - centered), abs(row - middle_row), row, column)
+                if best is None or score < best:
+                    best = score
+        return None if best is None else (best[2], best[3])
+
+    def available_seats(self) -> List[str]:
+        """Return the labels of all free seats, in row-major order."""
+        if self._available is None:
+            available = []
+            for labels, mask in zip(_row_labels(self.rows, self.columns), self.taken):
+                if not mask:
+                    available.extend(labels)
+                else:
+                    available.extend(
+                        label for column, label in enumerate(labels)
+                        if not mask >> column & 1)
+            self._available = available
+        return self._available
+
+
+class SeatInventory:
+    """
+    Registry of :class:`SeatMap` objects keyed by showtime ID.
+
+    At most ``max_size`` maps are kept; the least recently used one is
+    evicted to make room. A map older than ``ttl`` seconds is re-read by the
+    next request, so seats changed by other workers or directly in the
+    database are picked up.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._maps: OrderedDict = OrderedDict()
+        # Seat states recorded while the showtime is being (re-)seeded
+        self._changes: Dict[int, Dict[Tuple[int, int], bool]] = {}
+        self._seeding: Dict[int, asyncio.Future] = {}
+        # Counts invalidate_hall calls; each hall's latest call is kept by number
+        self._hall_invalidations = 0
+        self._hall_invalidated_at: Dict[int, int] = {}
+
+    async def get(self, showtime_id: int, db: AsyncSession) -> SeatMap:
+        """
+        Return the seat map for a showtime, seeding it from the database if needed.
+
+        The first caller seeds the map through its own session while later
+        callers wait for it. Should the seeding caller fail or go away, a
+        waiting caller takes over. An expired map is refreshed the same way,
+        except that other callers are served the current map meanwhile.
+
+        Raises:
+            HTTPException (404): If the showtime or its hall does not exist.
+        """
+        while True:
+            seat_map = self._maps.get(showtime_id)
+            if seat_map is not None:
+                self._maps.move_to_end(showtime_id)
+                if showtime_id in self._seeding or time.monotonic() - seat_map.loaded_at < self.ttl:
+                    return seat_map
+                break
+            seeding = self._seeding.get(showtime_id)
+            if seeding is None:
+                break
+            try:
+                # Shielded: a waiter that goes away must not cancel the seed
+                return await asyncio.shield(seeding)
+            except asyncio.CancelledError:
+                if not seeding.cancelled():
+                    raise
+
+        seeding = asyncio.get_running_loop().create_future()
+        self._seeding[showtime_id] = seeding
+        self._changes[showtime_id] = {}
+        started = self._hall_invalidations
+        try:
+            fresh = await self._load(showtime_id, db)
+        except BaseException as exc:
+            if self._seeding.get(showtime_id) is seeding:
+                del self._seeding[showtime_id]
+                del self._changes[showtime_id]
+                if isinstance(exc, HTTPException):
+                    # The showtime or its hall is gone
+                    self._maps.pop(showtime_id, None)
+            seeding.cancel()
+            raise
+        seat_map = self._store(showtime_id, fresh, seeding, started)
+        seeding.set_result(seat_map)
+        return seat_map
+
+    async def reconcile(self, showtime_id: int, seat_numbers: List[str], db: AsyncSession) -> None:
+        """
+        Re-read ``seat_numbers`` from the database into the showtime's map.
+
+        Used when the map proved to be behind the database, e.g. after
+        another worker took a seat. Only seats whose state differs are
+        changed and published, so subscribers keep their streams. If the map
+        changes during the read, the read may be older than the map and is
+        discarded.
+        """
+        seat_map = self._maps.get(showtime_id)
+        if seat_map is None:
+            return
+        version = seat_map.version
+        taken = set(await db.scalars(
+            select(Reservation.seat_number).where(
+                Reservation.showtime_id == showtime_id,
+                Reservation.seat_number.in_(seat_numbers),
+                Reservation.status.in_(TAKEN_STATUSES),
+            )
+        ))
+        if self._maps.get(showtime_id) is not seat_map or seat_map.version != version:
+            return
+        changed = []
+        for seat_number in seat_numbers:
+            row, column = parse_seat_number(seat_number)
+            if seat_map.set_taken(row, column, seat_number in taken):
+                changed.append((row, column, seat_number in taken, seat_map.version))
+        for row, column, seat_taken, version in changed:
+            self._publish(showtime_id, seat_map, row, column, seat_taken, version)
+
+    def update(
+        self,
+        showtime_id: int,
+        seat_number: str,
+        old_status: Optional[Status],
+        new_status: Optional[Status],
+    ) -> None:
+        """
+        Record that a reservation for ``seat_number`` moved between statuses.
+
+        ``None`` stands for "no reservation" (created or deleted rows).
+        """
+        taken = new_status in TAKEN_STATUSES
+        if (old_status in TAKEN_STATUSES) == taken:
+            return
+        row, column = parse_seat_number(seat_number)
+        changes = self._changes.get(showtime_id)
+        if changes is not None:
+            changes[row, column] = taken
+        seat_map = self._maps.get(showtime_id)
+        changed = seat_map is not None and seat_map.set_taken(row, column, taken)
+        if changed:
+            self._publish(showtime_id, seat_map, row, column, taken, seat_map.version)
+        elif seat_map is None:
+            # A subscriber's map is being re-seeded; make it take a new snapshot
+            seat_events.publish(showtime_id, RESYNC)
+
+    def invalidate(self, showtime_id: int) -> None:
+        """Drop a showtime's map so it is re-seeded on next access."""
+        self._maps.pop(showtime_id, None)
+        # A seed already under way may have read the old state
+        self._seeding.pop(showtime_id, None)
+        self._changes.pop(showtime_id, None)
+        seat_events.publish(showtime_id, RESYNC)
+
+    def invalidate_hall(self, hall_id: int) -> None:
+        """
+        Drop the maps of every showtime held in ``hall_id``.
+
+        Seeds under way for those showtimes are abandoned. A first seed has
+        no map to tell its hall by, so :meth:`_store` discards any seed that
+        read ``hall_id`` before this call.
+        """
+        self._hall_invalidations += 1
+        self._hall_invalidated_at[hall_id] = self._hall_invalidations
+        dropped = [showtime_id for showtime_id, seat_map in self._maps.items()
+                   if seat_map.hall_id == hall_id]
+        for showtime_id in dropped:
+            del self._maps[showtime_id]
+            self._seeding.pop(showtime_id, None)
+            self._changes.pop(showtime_id, None)
+            seat_events.publish(showtime_id, RESYNC)
+
+    def _store(self, showtime_id: int, fresh: SeatMap, seeding: asyncio.Future, started: int) -> SeatMap:
+        """
+        Keep a map just read from the database and return the one to serve.
+
+        Seat changes recorded during the read are applied on top of it. An
+        existing map with the same geometry is corrected in place, publishing
+        only the seats that differ; otherwise ``fresh`` replaces it.
+        ``started`` is the count of hall invalidations when the read began.
+        """
+        if self._seeding.get(showtime_id) is not seeding:
+            # Invalidated during the read: serve it to the current callers only
+            return fresh
+        del self._seeding[showtime_id]
+        if self._hall_invalidated_at.get(fresh.hall_id, 0) > started:
+            # The hall changed during the read
+            del self._changes[showtime_id]
+            return fresh
+        changed = []
+        replaced = False
+        for (row, column), taken in self._changes.pop(showtime_id).items():
+            fresh.set_taken(row, column, taken)
+        seat_map = self._maps.get(showtime_id)
+        if seat_map is not None and (seat_map.hall_id, seat_map.rows, seat_map.columns) == (
+                fresh.hall_id, fresh.rows, fresh.columns):
+            for row, (current, actual) in enumerate(zip(seat_map.taken, fresh.taken)):
+                differing = current ^ actual
+                while differing:
+                    column = (differing & -differing).bit_length() - 1
+                    differing &= differing - 1
+                    taken = bool(actual >> column & 1)
+                    seat_map.set_taken(row, column, taken)
+                    changed.append((row, column, taken, seat_map.version))
+            seat_map.loaded_at = fresh.loaded_at
+        else:
+            replaced = seat_map is not None
+            seat_map = self._maps[showtime_id] = fresh
+            while len(self._maps) > self.max_size:
+                self._maps.popitem(last=False)
+        if replaced:
+            seat_events.publish(showtime_id, RESYNC)
+        for row, column, taken, version in changed:
+            self._publish(showtime_id, seat_map, row, column, taken, version)
+        return seat_map
+
+    @staticmethod
+    def _publish(showtime_id: int, seat_map: SeatMap, row: int, column: int, taken: bool, version: int) -> None:
+        if seat_events.has_subscribers(showtime_id):
+            seat_events.publish(showtime_id, SeatEvent(
+                seat_map.seed, version, format_sse("seat", {
+                    "seat": seat_label(row, column),
+                    "available": not taken,
+                    "version": version,
+                })))
+
+    async def _load(self, showtime_id: int, db: AsyncSession) -> SeatMap:
+        geometry = (await db.execute(
+            select(Showtime.hall_id, Hall.rows, Hall.columns)
+            .outerjoin(Hall, Showtime.hall_id == Hall.id)
+            .where(Showtime.id == showtime_id)
+        )).first()
+        if geometry is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Showtime not found")
+        if geometry.rows is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Hall not found")
+        seat_map = SeatMap(geometry.hall_id, geometry.rows, geometry.columns)
+        seat_numbers = await db.scalars(
+            select(Reservation.seat_number).where(
+                Reservation.showtime_id == showtime_id,
+                Reservation.status.in_(TAKEN_STATUSES),
+            )
+        )
+        for seat_number in seat_numbers:
+            row, column = parse_seat_number(seat_number)
+            seat_map.set_taken(row, column, True)
+        return seat_map
+
+
+seat_inventory = SeatInventory(settings.SEAT_INVENTORY_SIZE, settings.SEAT_INVENTORY_TTL)
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Index, CheckConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.functions import now
 from src.database import Base
 from .schemas import Status
 
+# Statuses under which a reservation holds its seat; at most one reservation
+# per seat and showtime may be in one of them.
+ACTIVE_STATUSES = (Status.PENDING.value, Status.CONFIRMED.value)
+
 
 class Reservation(Base):
     __tablename__ = "reservation"
@@ -14,5 +18,20 @@ class Reservation(Base):
     price = Column(Numeric(10, 2), nullable=False)
     status = Column(String(20), nullable=False)
     created_at = Column(DateTime, server_default=now())
+    # When a PENDING hold lapses; cleared once the reservation is decided
+    expires_at = Column(DateTime)
     user = relationship("User", back_populates="reservation")
     showtime = relationship("Showtime", back_populates="reservation")
+
+    __table_args__ = (
+        Index('uq_reservation_active_seat', 'showtime_id', 'seat_number',
+              unique=True, postgresql_where=status.in_(ACTIVE_STATUSES)),
+        Index('ix_reservation_showtime_id_status', 'showtime_id', 'status'),
+        Index('ix_reservation_user_id', 'user_id'),
+        Index('ix_reservation_pending_expires_at', 'expires_at',
+              postgresql_where=status == Status.PENDING.value),
+        Index('ix_reservation_confirmed_created_at', 'created_at',
+              postgresql_where=status == Status.CONFIRMED.value),
+        CheckConstraint(status.in_([s.value for s in Status]),
+                        name='ck_reservation_status'),
+    )
@@ -1,11 +1,22 @@
 import logging
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.database import get_db
 from src.features.users.models import User
 from src.features.auth.services import get_current_user
-from .services import create_reservation, cancel_reservation, get_available_seats, get_user_reservations
-from .schemas import ReservationCreate, ReservationResponse, ReservationCancelResponse
+from src.utils.etag import CACHE_CONTROL, etag_matches, not_modified
+from src.utils.pagination import Page, cursor_query, limit_query
+from .services import (
+    create_reservation, create_reservations, cancel_reservation,
+    get_available_seats, get_seat_map_etag, stream_available_seats, get_user_reservations,
+    find_best_seats, claim_best_seats
+)
+from .schemas import (
+    ReservationCreate, ReservationBatchCreate, ReservationResponse, ReservationCancelResponse,
+    BestSeatsClaim, BestSeatsResponse, MAX_SEATS_PER_REQUEST
+)
 
 router = APIRouter(tags=["reservation"])
 logger = logging.getLogger(__name__)
@@ -14,32 +25,88 @@ logger = logging.getLogger(__name__)
 @router.post("/", response_model=ReservationResponse, status_code=status.HTTP_201_CREATED)
 async def create_reservation_endpoint(
     reservation: ReservationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     logger.info(
         f"Creating reservation for user ID: {current_user.id}, showtime ID: {reservation.showtime_id}")
-    return create_reservation(reservation, current_user, db)
+    return await create_reservation(reservation, current_user, db)
+
+
+@router.post("/batch", response_model=list[ReservationResponse], status_code=status.HTTP_201_CREATED)
+async def create_reservations_endpoint(
+    batch: ReservationBatchCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    logger.info(
+        f"Creating {len(batch.seat_numbers)} reservations for user ID: {current_user.id}, "
+        f"showtime ID: {batch.showtime_id}")
+    return await create_reservations(batch, current_user, db)
+
+
+@router.post("/best", response_model=list[ReservationResponse], status_code=status.HTTP_201_CREATED)
+async def claim_best_seats_endpoint(
+    claim: BestSeatsClaim,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    logger.info(
+        f"Claiming {claim.size} best seats for user ID: {current_user.id}, showtime ID: {claim.showtime_id}")
+    return await claim_best_seats(claim, current_user, db)
 
 
 @router.delete("/{reservation_id}", response_model=ReservationCancelResponse)
 async def cancel_reservation_endpoint(
     reservation_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     logger.info(
         f"Cancelling reservation ID: {reservation_id} by user ID: {current_user.id}")
-    return cancel_reservation(reservation_id, current_user, db)
+    return await cancel_reservation(reservation_id, current_user, db)
 
 
 @router.get("/showtime/{showtime_id}/seats")
-async def get_available_seats_endpoint(showtime_id: int, db: Session = Depends(get_db)):
+async def get_available_seats_endpoint(
+    showtime_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+):
     logger.info(f"Fetching available seats for showtime ID: {showtime_id}")
-    return get_available_seats(showtime_id, db)
+    etag = await get_seat_map_etag(showtime_id, db)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return await get_available_seats(showtime_id, db)
+
+
+@router.get("/showtime/{showtime_id}/seats/best", response_model=BestSeatsResponse)
+async def find_best_seats_endpoint(
+    showtime_id: int,
+    size: int = Query(..., ge=1, le=MAX_SEATS_PER_REQUEST),
+    db: AsyncSession = Depends(get_db),
+):
+    logger.info(f"Finding {size} best seats for showtime ID: {showtime_id}")
+    return await find_best_seats(showtime_id, size, db)
 
 
-@router.get("/", response_model=list[ReservationResponse])
-async def get_user_reservations_endpoint(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+@router.get("/showtime/{showtime_id}/seats/stream")
+async def stream_available_seats_endpoint(showtime_id: int, db: AsyncSession = Depends(get_db)):
+    logger.info(f"Streaming seat availability for showtime ID: {showtime_id}")
+    events = await stream_available_seats(showtime_id, db)
+    return StreamingResponse(events, media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.get("/", response_model=Page[ReservationResponse])
+async def get_user_reservations_endpoint(
+    cursor: Optional[str] = cursor_query,
+    limit: int = limit_query(),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
     logger.info(f"Fetching reservations for user ID: {current_user.id}")
-    return get_user_reservations(current_user, db)
+    return await get_user_reservations(current_user, cursor, limit, db)
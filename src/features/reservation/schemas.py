@@ -1,8 +1,12 @@
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
 from pydantic import field_serializer
 
+# Most seats one request may reserve or search for
+MAX_SEATS_PER_REQUEST = 50
+
 
 class Status(str, Enum):
     PENDING = "PENDING"
@@ -19,12 +23,28 @@ class ReservationCreate(ReservationBase):
     pass
 
 
+class ReservationBatchCreate(BaseModel):
+    showtime_id: int
+    seat_numbers: List[str] = Field(..., min_length=1, max_length=MAX_SEATS_PER_REQUEST)
+
+
+class BestSeatsClaim(BaseModel):
+    showtime_id: int
+    size: int = Field(..., ge=1, le=MAX_SEATS_PER_REQUEST)
+
+
+class BestSeatsResponse(BaseModel):
+    showtime_id: int
+    seat_numbers: List[str]
+
+
 class ReservationResponse(ReservationBase):
     id: int
     user_id: int
     price: float
     created_at: datetime
     status: Status
+    expires_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
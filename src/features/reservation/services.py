@@ -1,97 +1,277 @@
-from typing import List
+import asyncio
+from datetime import timedelta
+from typing import AsyncIterator, List, Optional
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, String, bindparam, func, literal, select, values, column as sql_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.features.showtime.models import Showtime
 from src.features.hall.models import Hall
 from src.features.users.models import User
-from .models import Reservation, Status
-from .schemas import ReservationCreate, ReservationResponse
+from src.features.admin.rollup import record_sale
+from src.config.settings import settings
+from src.database import SessionLocal
+from src.utils.pagination import Page, keyset, make_page
+from .models import Reservation, Status, ACTIVE_STATUSES
+from .schemas import (
+    ReservationCreate, ReservationBatchCreate, ReservationResponse, BestSeatsClaim, BestSeatsResponse
+)
+from .inventory import SeatMap, seat_inventory, seat_label, parse_seat_number
+from .events import RESYNC, format_sse, seat_events
 
+# Largest seat index that fits the int4 seat_row/seat_column columns
+_MAX_SEAT_INDEX = 2**31 - 1
 
-def create_reservation(reservation: ReservationCreate, current_user: User, db: Session):
-    showtime = db.query(Showtime).filter(
-        Showtime.id == reservation.showtime_id).first()
-    if not showtime:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Showtime not found")
-    seat_number_upper = reservation.seat_number.upper()
-    existing_reservation = db.query(Reservation).filter(
-        Reservation.showtime_id == reservation.showtime_id,
-        Reservation.seat_number == seat_number_upper,
-    ).first()
-    if existing_reservation:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Seat already reserved")
-    hall = db.query(Hall).filter(Hall.id == showtime.hall_id).first()
+# SQLSTATEs of a claim that lost to a concurrent one (deadlock_detected,
+# serialization_failure); answered like any other taken seat
+_LOST_RACE_SQLSTATES = frozenset({"40P01", "40001"})
+
+
+async def _claim_seats(showtime_id: int, requested: List[str], user_id: int, db: AsyncSession) -> List[Reservation]:
+    """
+    Insert PENDING reservations (seat holds) for ``requested`` seats in one statement.
+
+    Each hold expires ``SEAT_HOLD_TTL`` seconds after it is created unless
+    an admin decides it first; the hold reaper then frees the seat.
+
+    The showtime lookup, hall bounds check and insert run as a single
+    ``INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING``; the partial
+    unique index on active reservations arbitrates concurrent buyers. Only
+    when fewer rows come back than were requested is a second query issued
+    to explain why. All seats are claimed or none are. Seats are inserted
+    in (row, column) order, so overlapping batches lock the index entries in
+    the same order instead of deadlocking.
+
+    Raises:
+        HTTPException (400): If a seat is malformed, repeated or outside the hall.
+        HTTPException (404): If the showtime does not exist.
+        HTTPException (409): If a seat is already reserved.
+    """
+    seats = {}
+    for seat_number in requested:
+        row, column = parse_seat_number(seat_number)
+        if not 0 <= row <= _MAX_SEAT_INDEX or not 0 <= column <= _MAX_SEAT_INDEX:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid seat number: {seat_number}")
+        label = seat_label(row, column)
+        if label in seats:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="Duplicate seat numbers in request")
+        seats[label] = (row, column)
+
+    requested_seats = values(
+        sql_column("seat_number", String), sql_column(
+            "seat_row", Integer), sql_column("seat_column", Integer),
+        name="requested_seats",
+    ).data(sorted(((label, row, column) for label, (row, column) in seats.items()),
+                  key=lambda seat: seat[1:]))
+    claimable = select(
+        literal(user_id), Showtime.id, requested_seats.c.seat_number,
+        Showtime.price, literal(Status.PENDING.value),
+        func.localtimestamp() + timedelta(seconds=settings.SEAT_HOLD_TTL),
+    ).join(Hall, Showtime.hall_id == Hall.id).join(
+        requested_seats,
+        (requested_seats.c.seat_row < Hall.rows) & (
+            requested_seats.c.seat_column < Hall.columns),
+    ).where(Showtime.id == showtime_id).order_by(
+        requested_seats.c.seat_row, requested_seats.c.seat_column)
+    stmt = insert(Reservation).from_select(
+        ["user_id", "showtime_id", "seat_number", "price", "status", "expires_at"], claimable
+    ).on_conflict_do_nothing(
+        index_elements=["showtime_id", "seat_number"],
+        # Inlined: Postgres cannot match the partial index against bound
+        # parameters once it switches the prepared statement to a generic plan
+        index_where=Reservation.status.in_(
+            bindparam("active_statuses", ACTIVE_STATUSES, expanding=True, literal_execute=True)),
+    ).returning(Reservation)
+    try:
+        reservations = (await db.scalars(stmt)).all()
+    except DBAPIError as exc:
+        if getattr(exc.orig, "sqlstate", None) not in _LOST_RACE_SQLSTATES:
+            raise
+        reservations = []
+    if len(reservations) == len(seats):
+        await db.commit()
+        for db_reservation in reservations:
+            seat_inventory.update(db_reservation.showtime_id,
+                                  db_reservation.seat_number, None, db_reservation.status)
+        return reservations
+
+    claimed = {db_reservation.seat_number for db_reservation in reservations}
+    await db.rollback()
+    hall = await db.scalar(select(Hall).join(Showtime, Showtime.hall_id == Hall.id).where(
+        Showtime.id == showtime_id))
     if not hall:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Hall not found")
-    try:
-        row_letter = seat_number_upper[0]
-        col_number = int(seat_number_upper[1:])
-        row_index = ord(row_letter) - ord('A') + 1
-        if row_index < 1 or row_index > hall.rows or col_number < 1 or col_number > hall.columns:
+            status_code=status.HTTP_404_NOT_FOUND, detail="Showtime not found")
+    for label, (row, column) in seats.items():
+        if row >= hall.rows or column >= hall.columns:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid seat number")
-    except (ValueError, IndexError) as exc:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
-                            detail="Invalid seat number format") from exc
-    db_reservation = Reservation(
-        user_id=current_user.id,
-        showtime_id=reservation.showtime_id,
-        seat_number=seat_number_upper,
-        price=showtime.price,
-        status=Status.PENDING
-    )
-    db.add(db_reservation)
-    db.commit()
-    db.refresh(db_reservation)
-    return db_reservation
-
-
-def cancel_reservation(reservation_id: int, current_user: User, db: Session):
-    reservation = db.query(Reservation).filter(
-        Reservation.id == reservation_id).first()
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid seat number: {label}")
+    taken = sorted(label for label in seats if label not in claimed)
+    if len(seats) == 1:
+        detail = "Seat already reserved"
+    else:
+        detail = f"Seats already reserved: {', '.join(taken)}"
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+async def create_reservation(reservation: ReservationCreate, current_user: User, db: AsyncSession):
+    return (await _claim_seats(reservation.showtime_id, [reservation.seat_number], current_user.id, db))[0]
+
+
+async def create_reservations(batch: ReservationBatchCreate, current_user: User, db: AsyncSession) -> List[ReservationResponse]:
+    """
+    Reserve several seats of one showtime in a single transaction.
+
+    Either every requested seat is reserved or none is.
+
+    Raises:
+        HTTPException (404): If the showtime does not exist.
+        HTTPException (400): If a seat is invalid or repeated.
+        HTTPException (409): If a seat is already reserved.
+    """
+    return await _claim_seats(batch.showtime_id, batch.seat_numbers, current_user.id, db)
+
+
+async def cancel_reservation(reservation_id: int, current_user: User, db: AsyncSession):
+    reservation = await db.get(Reservation, reservation_id)
     if not reservation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
     if reservation.user_id != current_user.id and current_user.role != "ADMIN":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
                             detail="Not authorized to cancel this reservation")
-    db.delete(reservation)
-    db.commit()
+    showtime_id, seat_number, old_status = (
+        reservation.showtime_id, reservation.seat_number, reservation.status)
+    if old_status == Status.CONFIRMED:
+        await record_sale(reservation, -1, db)
+    await db.delete(reservation)
+    await db.commit()
+    seat_inventory.update(showtime_id, seat_number, old_status, None)
     return {"message": "Reservation cancelled successfully"}
 
 
-def get_available_seats(showtime_id: int, db: Session):
-    showtime = db.query(Showtime).filter(Showtime.id == showtime_id).first()
-    if not showtime:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Showtime not found")
-    hall = db.query(Hall).filter(Hall.id == showtime.hall_id).first()
-    if not hall:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Hall not found")
-    reserved_seats = db.query(Reservation).filter(
-        Reservation.showtime_id == showtime_id,
-        Reservation.status == Status.CONFIRMED  # Only consider confirmed reservations
-    ).all()
-    reserved_seats = {seat.seat_number.upper()
-                      for seat in reserved_seats}
-    available_seats = []
-    for row in range(1, hall.rows + 1):
-        row_letter = chr(ord('A') + row - 1)
-        for col in range(1, hall.columns + 1):
-            seat_number = f"{row_letter}{col}"
-            if seat_number not in reserved_seats:
-                available_seats.append(seat_number)
-    return {"showtime_id": showtime_id, "available_seats": available_seats}
-
-
-def get_user_reservations(current_user: User, db: Session) -> List[ReservationResponse]:
-    reservations = db.query(Reservation).filter(
-        Reservation.user_id == current_user.id).all()
-    if not reservations:
+async def get_seat_map_etag(showtime_id: int, db: AsyncSession) -> str:
+    return (await seat_inventory.get(showtime_id, db)).etag
+
+
+async def get_available_seats(showtime_id: int, db: AsyncSession):
+    seat_map = await seat_inventory.get(showtime_id, db)
+    return {"showtime_id": showtime_id, "available_seats": seat_map.available_seats()}
+
+
+# Attempts at claiming a best-available block before giving up
+_BEST_SEATS_ATTEMPTS = 3
+
+
+def _best_block(seat_map: SeatMap, size: int) -> List[str]:
+    block = seat_map.best_block(size)
+    if block is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT,
+                            detail=f"No block of {size} adjacent seats is available")
+    row, first_column = block
+    return [seat_label(row, column) for column in range(first_column, first_column + size)]
+
+
+async def find_best_seats(showtime_id: int, size: int, db: AsyncSession) -> BestSeatsResponse:
+    """
+    Return the best block of ``size`` adjacent free seats in one row.
+
+    Raises:
+        HTTPException (404): If the showtime or its hall does not exist.
+        HTTPException (409): If no row has ``size`` adjacent free seats.
+    """
+    seat_map = await seat_inventory.get(showtime_id, db)
+    return BestSeatsResponse(showtime_id=showtime_id, seat_numbers=_best_block(seat_map, size))
+
+
+async def claim_best_seats(claim: BestSeatsClaim, current_user: User, db: AsyncSession) -> List[ReservationResponse]:
+    """
+    Hold the best block of ``claim.size`` adjacent free seats.
+
+    The block is chosen from this worker's seat map and claimed through
+    :func:`_claim_seats`, so all seats are held or none are. If another
+    buyer (or another worker) took one of them first, the map is reconciled
+    with the database for those seats and a new block is tried.
+
+    Raises:
+        HTTPException (404): If the showtime or its hall does not exist.
+        HTTPException (409): If no block is available or every attempt lost a race.
+    """
+    # Read before a failed claim's rollback expires the user
+    user_id = current_user.id
+    for attempt in range(_BEST_SEATS_ATTEMPTS):
+        seat_map = await seat_inventory.get(claim.showtime_id, db)
+        seat_numbers = _best_block(seat_map, claim.size)
+        try:
+            return await _claim_seats(claim.showtime_id, seat_numbers, user_id, db)
+        except HTTPException as exc:
+            if exc.status_code != status.HTTP_409_CONFLICT or attempt == _BEST_SEATS_ATTEMPTS - 1:
+                raise
+            await seat_inventory.reconcile(claim.showtime_id, seat_numbers, db)
+
+
+async def _seat_snapshot(showtime_id: int) -> SeatMap:
+    async with SessionLocal() as db:
+        return await seat_inventory.get(showtime_id, db)
+
+
+async def _seat_stream(showtime_id: int) -> AsyncIterator[str]:
+    queue = seat_events.subscribe(showtime_id)
+    try:
+        seat_map = None
+        while True:
+            if seat_map is None:
+                seat_map = await _seat_snapshot(showtime_id)
+                seed, version = seat_map.seed, seat_map.version
+                yield format_sse("snapshot", {
+                    "showtime_id": showtime_id,
+                    "available_seats": seat_map.available_seats(),
+                    "version": version,
+                })
+            try:
+                event = await asyncio.wait_for(queue.get(), settings.SEAT_STREAM_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is RESYNC or event.seed != seed:
+                seat_map = None
+            elif event.version > version:
+                version = event.version
+                yield event.message
+    finally:
+        seat_events.unsubscribe(showtime_id, queue)
+
+
+async def stream_available_seats(showtime_id: int, db: AsyncSession) -> AsyncIterator[str]:
+    """
+    Return a server-sent event stream of a showtime's seat availability.
+
+    The stream opens with a ``snapshot`` event holding every free seat and
+    then sends one ``seat`` event per seat that becomes taken or free. It
+    sends a new snapshot whenever the showtime's map is re-seeded or the
+    subscriber falls behind.
+
+    Raises:
+        HTTPException (404): If the showtime or its hall does not exist.
+    """
+    await seat_inventory.get(showtime_id, db)
+    return _seat_stream(showtime_id)
+
+
+async def get_user_reservations(
+    current_user: User,
+    cursor: Optional[str],
+    limit: int,
+    db: AsyncSession
+) -> Page[ReservationResponse]:
+    reservations = (await db.scalars(keyset(
+        select(Reservation).where(Reservation.user_id == current_user.id),
+        [Reservation.id], cursor, limit,
+    ))).all()
+    if not reservations and not cursor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="No reservation found")
-    return reservations
+    return make_page(reservations, limit, lambda reservation: (reservation.id,))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Numeric
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Numeric, Index, func
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.schema import UniqueConstraint
 from src.database import Base
@@ -19,4 +19,10 @@ class Showtime(Base):
     __table_args__ = (
         UniqueConstraint('movie_id', 'hall_id', 'start_time',
                          name='unique_showtime'),
+        Index('ix_showtime_start_time', 'start_time'),
+        Index('ix_showtime_movie_id_start_time', 'movie_id', 'start_time'),
+        Index('ix_showtime_hall_id_start_time', 'hall_id', 'start_time'),
+        # Range lookups for hall overlap checks
+        Index('ix_showtime_time_range', func.tsrange(start_time, end_time),
+              postgresql_using='gist'),
     )
@@ -0,0 +1,105 @@
+"""Detection of overlapping showtimes in a hall.
+
+Two showtimes in the same hall clash when one starts before the other has
+ended plus ``SHOWTIME_CLEANING_GAP_MINUTES``. :func:`check_hall_overlaps`
+validates a whole batch of new or moved showtimes at once: it loads the
+existing showtimes of the affected halls that fall inside the batch's time
+window through the GiST index on ``tsrange(start_time, end_time)``, then
+sorts old and new intervals per hall and sweeps them once, so a batch of
+``n`` showtimes costs ``O(n log n)`` however long the hall's history is.
+
+Transaction-scoped advisory locks on the hall IDs serialize concurrent
+writers to the same hall until they commit, so two requests cannot both pass
+the check with clashing showtimes.
+"""
+
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import Integer, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.config.settings import settings
+from .models import Showtime
+
+# Advisory lock namespace for hall schedules (first key of the two-key form)
+_HALL_LOCK_SPACE = 0x5348
+
+
+class _Interval(NamedTuple):
+    hall_id: int
+    start: datetime
+    end: datetime
+    showtime_id: Optional[int]  # None for a showtime that is being created
+    new: bool
+
+
+def _describe(interval: _Interval) -> str:
+    label = "new showtime" if interval.showtime_id is None else f"showtime {interval.showtime_id}"
+    return f"{label} ({interval.start.isoformat()} to {interval.end.isoformat()})"
+
+
+def find_overlaps(intervals: Iterable[_Interval], gap: timedelta) -> List[Tuple[_Interval, _Interval]]:
+    """
+    Return clashing pairs that involve at least one new interval.
+
+    Each hall's intervals are sorted by start and compared with the one
+    reaching furthest so far, which reports every new interval that clashes
+    with anything at least once.
+    """
+    conflicts = []
+    ordered = sorted(intervals, key=lambda interval: (interval.hall_id, interval.start))
+    for _, hall_intervals in groupby(ordered, key=lambda interval: interval.hall_id):
+        furthest = None
+        for interval in hall_intervals:
+            if furthest is not None and interval.start < furthest.end + gap \
+                    and (interval.new or furthest.new):
+                conflicts.append((furthest, interval))
+            if furthest is None or interval.end > furthest.end:
+                furthest = interval
+    return conflicts
+
+
+async def check_hall_overlaps(
+    db: AsyncSession,
+    candidates: Sequence[Tuple[int, datetime, datetime, Optional[int]]],
+) -> None:
+    """
+    Validate ``(hall_id, start_time, end_time, showtime_id)`` candidates.
+
+    ``showtime_id`` is ``None`` for showtimes being created, or the ID of a
+    showtime being moved so that its current row is not counted against it.
+    Must run inside the transaction that writes the candidates.
+
+    Raises:
+        HTTPException (409): If a candidate clashes with another candidate or
+            an existing showtime in the same hall.
+    """
+    if not candidates:
+        return
+    gap = timedelta(minutes=settings.SHOWTIME_CLEANING_GAP_MINUTES)
+    hall_ids = sorted({hall_id for hall_id, _, _, _ in candidates})
+    # One round trip; locks are taken in hall ID order so writers never deadlock
+    keys = func.unnest(bindparam("hall_ids", hall_ids, type_=ARRAY(Integer))) \
+        .table_valued("k").render_derived()
+    await db.execute(select(func.pg_advisory_xact_lock(_HALL_LOCK_SPACE, keys.c.k)).order_by(keys.c.k))
+    window_start = min(start for _, start, _, _ in candidates) - gap
+    window_end = max(end for _, _, end, _ in candidates) + gap
+    moved = [showtime_id for *_, showtime_id in candidates if showtime_id is not None]
+    query = select(Showtime.id, Showtime.hall_id, Showtime.start_time, Showtime.end_time).where(
+        Showtime.hall_id.in_(hall_ids),
+        func.tsrange(Showtime.start_time, Showtime.end_time).op("&&")(
+            func.tsrange(window_start, window_end)),
+    )
+    if moved:
+        query = query.where(Showtime.id.not_in(moved))
+    intervals = [_Interval(hall_id, start, end, showtime_id, False)
+                 for showtime_id, hall_id, start, end in await db.execute(query)]
+    intervals.extend(_Interval(hall_id, start, end, showtime_id, True)
+                     for hall_id, start, end, showtime_id in candidates)
+    conflicts = find_overlaps(intervals, gap)
+    if conflicts:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Showtimes overlap: " + "; ".join(
+            f"hall {first.hall_id}: {_describe(first)} and {_describe(second)}"
+            for first, second in conflicts[:10]))
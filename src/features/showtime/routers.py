@@ -1,22 +1,33 @@
 import logging
 from datetime import date
-from typing import Optional, List
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, Request
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.database import get_db
+from src.utils.response_cache import response_cache
 from .services import get_showtimes
+from src.utils.pagination import Page, cursor_query, limit_query
 from .schemas import ShowtimeResponse
 
 router = APIRouter(tags=["showtime"])
 logger = logging.getLogger(__name__)
 
+_showtime_page = TypeAdapter(Page[ShowtimeResponse])
 
-@router.get("/", response_model=List[ShowtimeResponse])
+
+@router.get("/", response_model=Page[ShowtimeResponse])
 async def get_showtimes_endpoint(
+    request: Request,
     movie_id: Optional[int] = None,
     showtime_date: Optional[date] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = cursor_query,
+    limit: int = limit_query(),
+    db: AsyncSession = Depends(get_db)
 ):
     logger.info(
         f"Fetching showtimes with filters: movie_id={movie_id}, showtime_date={showtime_date}")
-    return get_showtimes(movie_id, showtime_date, db)
+    return await response_cache.respond(
+        request, _showtime_page,
+        lambda: get_showtimes(movie_id, showtime_date, cursor, limit, db),
+        lambda page: ["showtimes", *(f"movie:{s.movie_id}" for s in page.items)])
@@ -1,13 +1,15 @@
-from datetime import datetime
-from pydantic import BaseModel, field_validator, field_serializer
+from datetime import date, datetime, time
+from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator, field_serializer, model_validator
 from src.features.movie.schemas import MovieResponse
+from src.utils.datetimes import NaiveUTCDatetime
 
 
 class ShowtimeBase(BaseModel):
     movie_id: int
     hall_id: int
-    start_time: datetime
-    end_time: datetime
+    start_time: NaiveUTCDatetime
+    end_time: NaiveUTCDatetime
     price: float
 
 
@@ -21,6 +23,44 @@ class ShowtimeCreate(ShowtimeBase):
         return end_time
 
 
+# A bulk insert binds five parameters per showtime; this keeps a batch well
+# under the driver's 32767-parameter limit.
+MAX_BULK_SHOWTIMES = 5000
+
+
+class ShowtimeRecurrence(BaseModel):
+    """Screen a movie at ``times`` in every hall of ``hall_ids`` on each day of a range."""
+    movie_id: int
+    hall_ids: List[int] = Field(..., min_length=1)
+    start_date: date
+    end_date: date
+    times: List[time] = Field(..., min_length=1)
+    # Days of the week to include, 0 = Monday; every day when omitted
+    weekdays: Optional[List[int]] = None
+    price: float
+
+    @model_validator(mode='after')
+    def validate_range(self) -> 'ShowtimeRecurrence':
+        if self.end_date < self.start_date:
+            raise ValueError('end_date must not be before start_date')
+        if (self.end_date - self.start_date).days >= MAX_BULK_SHOWTIMES:
+            raise ValueError(f'The date range must span fewer than {MAX_BULK_SHOWTIMES} days')
+        if self.weekdays is not None and any(not 0 <= day <= 6 for day in self.weekdays):
+            raise ValueError('weekdays must be between 0 (Monday) and 6 (Sunday)')
+        return self
+
+
+class ShowtimeBulkCreate(BaseModel):
+    showtimes: List[ShowtimeCreate] = Field(default_factory=list, max_length=MAX_BULK_SHOWTIMES)
+    recurrence: Optional[ShowtimeRecurrence] = None
+
+    @model_validator(mode='after')
+    def validate_not_empty(self) -> 'ShowtimeBulkCreate':
+        if not self.showtimes and self.recurrence is None:
+            raise ValueError('Provide showtimes, a recurrence, or both')
+        return self
+
+
 class ShowtimeResponse(ShowtimeBase):
     id: int
     movie: MovieResponse
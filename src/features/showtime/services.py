@@ -1,22 +1,38 @@
-from datetime import date, timedelta
-from typing import Optional, List
+from datetime import date, datetime, time, timedelta
+from typing import Optional
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy.sql import func
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
 from src.features.movie.schemas import MovieResponse
 from src.features.movie.models import Movie
+from src.utils.pagination import Page, keyset, make_page
 from .models import Showtime
+from .overlap import check_hall_overlaps
 from .schemas import ShowtimeCreate, ShowtimeResponse
 
 
-def get_showtimes(movie_id: Optional[int], showtime_date: Optional[date], db: Session) -> List[ShowtimeResponse]:
-    query = db.query(Showtime)
+async def get_showtimes(
+    movie_id: Optional[int],
+    showtime_date: Optional[date],
+    cursor: Optional[str],
+    limit: int,
+    db: AsyncSession
+) -> Page[ShowtimeResponse]:
+    # Movies are loaded through the same joined SELECT, so the listing is a
+    # single query however many showtimes it returns.
+    query = select(Showtime).join(Showtime.movie).options(
+        contains_eager(Showtime.movie))
     if movie_id:
-        query = query.filter(Showtime.movie_id == movie_id)
+        query = query.where(Showtime.movie_id == movie_id)
     if showtime_date:
-        query = query.filter(func.date(Showtime.start_time) == showtime_date)
-    showtimes = query.all()
-    return [ShowtimeResponse(
+        # Half-open range on the raw column so the start_time indexes apply
+        day_start = datetime.combine(showtime_date, time.min)
+        query = query.where(Showtime.start_time >= day_start,
+                            Showtime.start_time < day_start + timedelta(days=1))
+    showtimes = (await db.scalars(
+        keyset(query, [Showtime.start_time, Showtime.id], cursor, limit))).all()
+    return make_page([ShowtimeResponse(
         id=showtime.id,
         movie_id=showtime.movie_id,
         hall_id=showtime.hall_id,
@@ -32,16 +48,16 @@ def get_showtimes(movie_id: Optional[int], showtime_date: Optional[date], db: Se
             description=showtime.movie.description,
             poster_url=showtime.movie.poster_url
         )
-    ) for showtime in showtimes]
+    ) for showtime in showtimes], limit, lambda showtime: (showtime.start_time, showtime.id))
 
 
-def create_showtime(showtime: ShowtimeCreate, db: Session) -> ShowtimeResponse:
+async def create_showtime(showtime: ShowtimeCreate, db: AsyncSession) -> ShowtimeResponse:
     # Check for duplicate showtime
-    existing_showtime = db.query(Showtime).filter(
+    existing_showtime = await db.scalar(select(Showtime).where(
         Showtime.movie_id == showtime.movie_id,
         Showtime.hall_id == showtime.hall_id,
         Showtime.start_time == showtime.start_time
-    ).first()
+    ))
     if existing_showtime:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -49,7 +65,7 @@ def create_showtime(showtime: ShowtimeCreate, db: Session) -> ShowtimeResponse:
         )
 
     # Validate end_time is after start_time and matches movie duration
-    movie = db.query(Movie).filter(Movie.id == showtime.movie_id).first()
+    movie = await db.get(Movie, showtime.movie_id)
     if not movie:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Movie not found")
@@ -66,11 +82,12 @@ def create_showtime(showtime: ShowtimeCreate, db: Session) -> ShowtimeResponse:
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"End time must match movie duration ({movie.duration} minutes)"
         )
+    await check_hall_overlaps(db, [(showtime.hall_id, showtime.start_time, showtime.end_time, None)])
 
     db_showtime = Showtime(**showtime.model_dump())
     db.add(db_showtime)
-    db.commit()
-    db.refresh(db_showtime)
+    await db.commit()
+    await db.refresh(db_showtime)
     return ShowtimeResponse(
         id=db_showtime.id,
         movie_id=db_showtime.movie_id,
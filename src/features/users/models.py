@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, CheckConstraint
 from sqlalchemy.sql.functions import now
 from sqlalchemy.orm import relationship
 from src.database import Base
@@ -16,3 +16,7 @@ class User(Base):
     created_at = Column(DateTime, server_default=now())
     reservation = relationship(
         "Reservation", back_populates="user", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        CheckConstraint(role.in_([r.value for r in Role]), name='ck_users_role'),
+    )
@@ -16,7 +16,7 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase):
     password: str
-    role: Optional[str] = "USER"
+    role: Optional[Role] = Role.USER
 
 
 class UserLogin(BaseModel):
@@ -1,3 +1,6 @@
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.features.users.routers import router as user_router
@@ -8,13 +11,28 @@ from src.features.reservation.routers import router as reservation_router
 from src.features.admin.routers import router as admin_router
 from src.features.auth.routers import router as auth_router
 from src.features.cinema.routers import router as cinema_router
-from src import models
+from src.database import engine
+from src.features.reservation.holds import run_hold_reaper
 from src.config.logging_config import setup_logging
+from src.utils.metrics import MetricsMiddleware, metrics_response
+from src.utils.query_stats import QueryStatsMiddleware
 
 # Setup logging
 logger = setup_logging()
 
-app = FastAPI(title="Cinema Seat Reservation API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    reaper = asyncio.create_task(run_hold_reaper())
+    yield
+    reaper.cancel()
+    # Let the reaper close its session before the pool goes away
+    with contextlib.suppress(asyncio.CancelledError):
+        await reaper
+    await engine.dispose()
+
+
+app = FastAPI(title="Cinema Seat Reservation API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -23,6 +41,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/")
@@ -30,6 +50,11 @@ async def root():
     logger.info("Root endpoint accessed")
     return {"message": "Welcome to Cinema Seat Reservation API. Visit /docs for API documentation."}
 
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return metrics_response()
+
 app.include_router(auth_router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(user_router, prefix="/api/v1/users", tags=["users"])
 app.include_router(movie_router, prefix="/api/v1/movie", tags=["movie"])
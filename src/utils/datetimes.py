@@ -0,0 +1,21 @@
+"""Datetime handling for request input.
+
+Timestamps are stored in naive ``timestamp`` columns holding UTC. asyncpg
+refuses to bind a timezone-aware ``datetime`` to such a column, so every
+incoming datetime is declared as :data:`NaiveUTCDatetime`, which converts an
+aware value (``2031-01-01T09:00:00Z``, ``...+02:00``) to UTC and drops the
+offset. Naive values are taken to be UTC already.
+"""
+
+from datetime import datetime, timezone
+from typing import Annotated
+from pydantic import AfterValidator
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+NaiveUTCDatetime = Annotated[datetime, AfterValidator(to_naive_utc)]
@@ -0,0 +1,99 @@
+"""Connection pool instrumentation.
+
+``InstrumentedQueuePool`` times how long each checkout waits for a
+connection, and :func:`instrument_pool` hooks SQLAlchemy pool events to count
+connections, checkouts and invalidations. :data:`pool_stats` holds the
+figures for the worker process.
+"""
+
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+
+class PoolStats:
+    """Counters for one connection pool."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.connections_opened = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.peak_checked_out = 0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkout_wait_total += seconds
+        if seconds > self.checkout_wait_max:
+            self.checkout_wait_max = seconds
+
+    def snapshot(self, pool: Pool) -> dict:
+        """Return the counters together with the pool's current occupancy."""
+        snapshot = {"pool_class": type(pool).__name__}
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            snapshot.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                # QueuePool reports negative overflow until the pool is full
+                "overflow": max(pool.overflow(), 0),
+                "timeout": pool.timeout(),
+            })
+        snapshot.update({
+            "peak_checked_out": self.peak_checked_out,
+            "connections_opened": self.connections_opened,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "invalidations": self.invalidations,
+            "checkout_timeouts": self.checkout_timeouts,
+            "checkout_wait_avg_ms": round(
+                self.checkout_wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "checkout_wait_max_ms": round(self.checkout_wait_max * 1000, 3),
+        })
+        return snapshot
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long checkouts wait for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.checkout_timeouts += 1
+            raise
+        finally:
+            pool_stats.record_wait(time.perf_counter() - start)
+
+
+def instrument_pool(engine: Engine) -> None:
+    """Attach the pool event listeners that feed :data:`pool_stats`."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        pool_stats.connections_opened += 1
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_stats.checkouts += 1
+        checked_out = pool_stats.checkouts - pool_stats.checkins
+        if checked_out > pool_stats.peak_checked_out:
+            pool_stats.peak_checked_out = checked_out
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        pool_stats.checkins += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        pool_stats.invalidations += 1
@@ -0,0 +1,26 @@
+"""Helpers for strong ETags and conditional GET (``If-None-Match``)."""
+
+import secrets
+from fastapi import Request, Response
+
+# Distinguishes validators issued by this worker process from those of other
+# workers or earlier runs whose in-memory version counters may coincide.
+PROCESS_EPOCH = secrets.token_hex(4)
+
+CACHE_CONTROL = "no-cache"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return ``True`` if the request's ``If-None-Match`` header lists ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so a W/ prefix is ignored
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304,
+                    headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
@@ -0,0 +1,77 @@
+"""Prometheus metrics for HTTP requests.
+
+``MetricsMiddleware`` counts requests and records latency histograms,
+labelled by method, route template (``/api/v1/movie/``,
+``/api/v1/reservation/{reservation_id}``, never the raw path) and status
+code, and tracks requests in flight by method. The route is the one the
+router recorded in the scope, so it is only known once the request has
+been handled. :func:`metrics_response` renders the default registry for the
+``/metrics`` endpoint. Latency covers the whole response, so the streaming
+endpoints report how long their streams stayed open.
+
+The registry lives in the worker process, like the other in-process stats.
+"""
+
+import time
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Label for requests that match no route, so unknown paths cannot grow the
+# number of time series.
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Dense below a second, where the API is expected to answer
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.25, 0.5, 0.75,
+                   1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled.", ["method", "route", "status"])
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled.", ["method"])
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time from receiving a request to sending the last of its response.",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS)
+
+
+def route_template(scope: Scope) -> str:
+    """Return the path template of the route that handled ``scope``."""
+    route = scope.get("route")
+    return getattr(route, "path_format", UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """ASGI middleware that feeds the request metrics."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            route = route_template(scope)
+            REQUESTS.labels(method, route, str(status_code)).inc()
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(elapsed)
+
+
+def metrics_response() -> Response:
+    """Render this worker's metrics in the Prometheus text format."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,82 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+A list query is ordered by a unique tuple of columns, typically ending in
+the primary key. Each page fetches one row more than it returns; when that
+extra row exists, ``next_cursor`` encodes the sort key of the last returned
+row, and the next page starts strictly after it with a row-value comparison
+``(a, b) > (:a, :b)`` that the matching index can seek to. Cursors are
+opaque URL-safe strings to clients.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Generic, List, Optional, Sequence, TypeVar
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from src.config.settings import settings
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def limit_query(default: int = settings.PAGE_SIZE_DEFAULT):
+    """``limit`` query parameter capped at ``PAGE_SIZE_MAX``."""
+    return Query(default, ge=1, le=settings.PAGE_SIZE_MAX,
+                 description="Maximum number of items to return")
+
+
+cursor_query = Query(
+    None, description="next_cursor from the previous page")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    plain = [value.isoformat() if isinstance(value, (date, datetime)) else value
+             for value in values]
+    return base64.urlsafe_b64encode(
+        json.dumps(plain, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> tuple:
+    """
+    Decode ``cursor`` into values typed like ``columns``.
+
+    Raises:
+        HTTPException (400): If the cursor is malformed or was issued for another list.
+    """
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(raw, list) or len(raw) != len(columns):
+            raise ValueError(cursor)
+        values = []
+        for value, column in zip(raw, columns):
+            python_type = column.type.python_type
+            if python_type in (date, datetime):
+                value = python_type.fromisoformat(value)
+            elif not isinstance(value, python_type):
+                raise ValueError(value)
+            values.append(value)
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Invalid cursor") from exc
+    return tuple(values)
+
+
+def keyset(query: Select, columns: Sequence, cursor: Optional[str], limit: int) -> Select:
+    """Order ``query`` by ``columns`` and restrict it to the page after ``cursor``."""
+    if cursor:
+        query = query.where(tuple_(*columns) > tuple_(*decode_cursor(cursor, columns)))
+    return query.order_by(*columns).limit(limit + 1)
+
+
+def make_page(rows: Sequence[T], limit: int, key: Callable[[T], Sequence[Any]]) -> Page[T]:
+    """Build a :class:`Page` from the ``limit + 1`` rows fetched by :func:`keyset`."""
+    if len(rows) > limit:
+        return Page(items=list(rows[:limit]), next_cursor=encode_cursor(key(rows[limit - 1])))
+    return Page(items=list(rows))
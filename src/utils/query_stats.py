@@ -0,0 +1,124 @@
+"""Per-request SQL statistics.
+
+:func:`instrument_queries` hooks ``before_cursor_execute`` and
+``after_cursor_execute`` on the engine to time every statement, and
+``QueryStatsMiddleware`` collects the figures of each HTTP request into a
+:class:`QueryStats` held in a context variable. SQLAlchemy runs the cursor
+events in a greenlet that shares the awaiting task's context, so statements
+are attributed to the request that issued them; work outside a request (the
+hold reaper, CLIs) is not counted.
+
+Responses carry the statement count in ``X-DB-Query-Count`` and the time
+spent in the database in a ``Server-Timing`` entry, both as of the moment
+the response headers are sent. When one statement shape (the SQL text with
+parameters and ``IN`` lists collapsed) runs more than
+``QUERY_REPEAT_WARN_THRESHOLD`` times in one request, a warning names the
+route and the statement, which is how N+1 loading shows up.
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_PARAMETER = re.compile(r"\$\d+(?:::\w+)?|%\(\w+\)s|\?")
+_PARAMETER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+
+
+def statement_shape(statement: str) -> str:
+    """Return ``statement`` with parameters, and lists of them, replaced by ``?``."""
+    return _PARAMETER_LIST.sub("?", _PARAMETER.sub("?", statement))
+
+
+class QueryStats:
+    """Statements executed while handling one request."""
+
+    __slots__ = ("count", "total_time", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_time += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> list:
+        """Return ``(shape, count)`` pairs that ran more than ``threshold`` times."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Return the statistics of the request being handled, if any."""
+    return _current.get()
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Attach the cursor event listeners that feed :class:`QueryStats`."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["query_start"].pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement, time.perf_counter() - start)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        # A failed statement never reaches after_cursor_execute
+        if exception_context.connection is not None:
+            starts = exception_context.connection.info.get("query_start")
+            if starts:
+                starts.pop()
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware that collects and reports the SQL statistics of each request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Query-Count", str(stats.count))
+                headers.append("Server-Timing", f"db;dur={stats.total_time * 1000:.2f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            repeated = stats.repeated(settings.QUERY_REPEAT_WARN_THRESHOLD)
+            if repeated:
+                route = scope.get("route")
+                path = getattr(route, "path_format", scope["path"])
+                shape, count = repeated[0]
+                logger.warning(
+                    f"Possible N+1 on {scope['method']} {path}: statement ran {count} times "
+                    f"({stats.count} queries, {stats.total_time * 1000:.1f} ms in total): {shape[:300]}")
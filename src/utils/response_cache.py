@@ -0,0 +1,169 @@
+"""Read-through cache of serialized JSON responses for catalog endpoints.
+
+Entries are keyed by route path and query string and hold the response body
+already encoded as JSON bytes, so a hit skips both the database and Pydantic.
+Each entry carries tags naming the data it was built from (``"movies"``,
+``"movie:3"``, ``"cinema:1:halls"``...); the admin services call
+:meth:`ResponseCache.invalidate` with the tags a write affects. Entries also
+expire after ``RESPONSE_CACHE_TTL`` seconds and the least recently used are
+evicted beyond ``RESPONSE_CACHE_SIZE``.
+
+Every entry also carries a strong ETag, a digest of its body computed once
+when the entry is filled, so a matching ``If-None-Match`` is answered with
+``304 Not Modified`` straight from the cache.
+
+Like the other in-process caches, every worker holds its own copy.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from src.config.settings import settings
+from src.utils.etag import CACHE_CONTROL, etag_matches, not_modified
+
+
+class ResponseCache:
+    """Bounded, TTL-based cache of JSON response bodies with tag invalidation."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        # Bumped by every invalidation; each tag keeps the value of its latest
+        self._generation = 0
+        self._invalidated_at: Dict[str, int] = {}
+        self._cleared_at = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @staticmethod
+    def key_for(request: Request) -> str:
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    @staticmethod
+    def etag_for(body: bytes) -> str:
+        return f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+    def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[3]
+
+    def put(self, key: str, body: bytes, etag: str, tags: Iterable[str], generation: int) -> None:
+        """
+        Store ``body`` under ``key``.
+
+        ``generation`` is the value of :attr:`generation` read before the
+        data was loaded; if one of ``tags`` was invalidated since, the body
+        may already be stale and is not stored.
+        """
+        if self.max_size <= 0:
+            return
+        tags = frozenset(tags)
+        with self._lock:
+            if self._cleared_at > generation or any(
+                    self._invalidated_at.get(tag, 0) > generation for tag in tags):
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, body, tags, etag)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every entry carrying any of ``tags``."""
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                self._invalidated_at[tag] = self._generation
+                for key in self._tags.pop(tag, ()):
+                    if key in self._entries:
+                        self._drop(key)
+                        self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._cleared_at = self._generation
+            self._invalidated_at.clear()
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    async def respond(
+        self,
+        request: Request,
+        adapter: TypeAdapter,
+        load: Callable[[], Awaitable[Any]],
+        tags: Callable[[Any], Iterable[str]],
+    ) -> Response:
+        """
+        Serve the request from the cache, or ``await load()`` and cache it.
+
+        ``adapter`` validates and serializes the loaded value (ORM objects are
+        read through their attributes) and ``tags`` names the data it covers.
+        Errors raised by ``load`` propagate and are never cached. A request
+        whose ``If-None-Match`` matches the entry's ETag gets a 304.
+        """
+        key = self.key_for(request)
+        cached = self.get(key)
+        if cached is not None:
+            body, etag = cached
+            cache_status = "HIT"
+        else:
+            generation = self.generation
+            data = adapter.validate_python(await load(), from_attributes=True)
+            body = adapter.dump_json(data)
+            etag = self.etag_for(body)
+            self.put(key, body, etag, tags(data), generation)
+            cache_status = "MISS"
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        return Response(content=body, media_type="application/json", headers={
+            "X-Cache": cache_status, "ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+    def _drop(self, key: str) -> None:
+        _, _, tags, _ = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_SIZE,
+                               settings.RESPONSE_CACHE_TTL)
@@ -0,0 +1,91 @@
+"""Streaming CSV, NDJSON and JSON array responses for large query results.
+
+Rows are fetched with a server-side cursor and sent in chunks of
+``STREAM_BATCH_SIZE`` encoded rows, so a report is never held in memory as a
+whole. The stream opens its
+own session: dependency sessions from ``get_db`` are closed before a
+``StreamingResponse`` body starts running.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import AsyncIterator, Sequence
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from src.database import SessionLocal
+
+STREAM_BATCH_SIZE = 1000
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+async def _rows(stmt: Select) -> AsyncIterator[Sequence]:
+    async with SessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for row in result:
+            yield row
+
+
+async def _chunked(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    # One send per batch of rows rather than per row
+    chunk = []
+    async for line in lines:
+        chunk.append(line)
+        if len(chunk) >= STREAM_BATCH_SIZE:
+            yield "".join(chunk)
+            chunk.clear()
+    if chunk:
+        yield "".join(chunk)
+
+
+async def _csv_lines(stmt: Select) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(stmt.selected_columns.keys())
+    async for row in _rows(stmt):
+        writer.writerow([_plain(value) for value in row])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+async def _ndjson_lines(stmt: Select) -> AsyncIterator[str]:
+    keys = stmt.selected_columns.keys()
+    async for row in _rows(stmt):
+        yield json.dumps({key: _plain(value) for key, value in zip(keys, row)}) + "\n"
+
+
+async def _json_array_chunks(stmt: Select) -> AsyncIterator[str]:
+    keys = stmt.selected_columns.keys()
+    separator = "["
+    async for row in _rows(stmt):
+        yield separator + json.dumps({key: _plain(value) for key, value in zip(keys, row)})
+        separator = ","
+    yield "[]" if separator == "[" else "]"
+
+
+def stream_csv(stmt: Select, filename: str) -> StreamingResponse:
+    """Stream the rows of ``stmt`` as a CSV attachment with a header line."""
+    return StreamingResponse(
+        _chunked(_csv_lines(stmt)), media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+def stream_ndjson(stmt: Select) -> StreamingResponse:
+    """Stream the rows of ``stmt`` as newline-delimited JSON objects."""
+    return StreamingResponse(_chunked(_ndjson_lines(stmt)), media_type="application/x-ndjson")
+
+
+def stream_json_array(stmt: Select) -> StreamingResponse:
+    """Stream the rows of ``stmt`` as one JSON array of objects, element by element."""
+    return StreamingResponse(_chunked(_json_array_chunks(stmt)), media_type="application/json")
@@ -0,0 +1,107 @@
+"""Shared fixtures.
+
+Unit tests need nothing but the code. Tests that use ``client`` run the app
+in process against ``DATABASE_URL``, which must point at a disposable
+database migrated with ``alembic upgrade head``; they are skipped when the
+database cannot be reached. Every such test creates its own rows.
+"""
+
+import os
+import uuid
+from datetime import datetime, timedelta
+import pytest
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+
+async def _ping():
+    from sqlalchemy import text
+    from src.database import engine
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from sqlalchemy.exc import SQLAlchemyError
+    from src.main import app
+    with TestClient(app) as client:
+        try:
+            client.portal.call(_ping)
+        except (OSError, SQLAlchemyError) as exc:
+            pytest.skip(f"Database unavailable: {exc}")
+        yield client
+
+
+@pytest.fixture(scope="session")
+def admin_email():
+    return f"admin-{uuid.uuid4().hex[:12]}@example.com"
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client, admin_email):
+    email = admin_email
+    response = client.post("/api/v1/auth/register", json={
+        "email": email, "full_name": "Test Admin", "password": "password", "role": "ADMIN"})
+    assert response.status_code == 201, response.text
+    response = client.post("/api/v1/auth/login", data={"username": email, "password": "password"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def _create_genre() -> int:
+    from src import models  # noqa: F401  (configures every mapper)
+    from src.database import SessionLocal
+    from src.features.genre.models import Genre
+    async with SessionLocal() as db:
+        genre = Genre(name=f"Genre {uuid.uuid4().hex[:12]}")
+        db.add(genre)
+        await db.commit()
+        return genre.id
+
+
+@pytest.fixture(scope="session")
+def genre_id(client):
+    return client.portal.call(_create_genre)
+
+
+async def _user_id(email: str) -> int:
+    from sqlalchemy import select
+    from src.database import SessionLocal
+    from src.features.users.models import User
+    async with SessionLocal() as db:
+        return await db.scalar(select(User.id).where(User.email == email))
+
+
+@pytest.fixture(scope="session")
+def admin_id(client, admin_headers, admin_email):
+    return client.portal.call(_user_id, admin_email)
+
+
+@pytest.fixture
+def build_cinema(client, admin_headers, genre_id):
+    def build(halls: int, showtimes_per_hall: int) -> dict:
+        def post(path, payload):
+            response = client.post(f"/api/v1/admin/{path}", json=payload, headers=admin_headers)
+            assert response.status_code == 201, response.text
+            return response.json()["id"]
+
+        cinema_id = post("cinema", {"name": "Test Cinema", "address": "Test Street"})
+        movie_id = post("movie", {"title": "Test Movie", "genre_id": genre_id,
+                                  "duration": 90, "release_date": "2024-01-01"})
+        showtime_ids = []
+        start = datetime(2030, 1, 1, 10)
+        for hall in range(halls):
+            hall_id = post("hall", {"name": f"Hall {hall}", "rows": 5, "columns": 8,
+                                    "cinema_id": cinema_id})
+            for day in range(showtimes_per_hall):
+                showtime_start = start + timedelta(days=day)
+                showtime_ids.append(post("showtime", {
+                    "movie_id": movie_id, "hall_id": hall_id, "price": 10,
+                    "start_time": showtime_start.isoformat(),
+                    "end_time": (showtime_start + timedelta(minutes=90)).isoformat(),
+                }))
+        return {"cinema_id": cinema_id, "movie_id": movie_id, "showtime_ids": showtime_ids}
+
+    return build
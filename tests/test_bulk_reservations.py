@@ -0,0 +1,63 @@
+from datetime import timedelta
+from sqlalchemy import func, update
+from src.database import SessionLocal
+from src.features.reservation.models import Reservation
+
+
+async def _expire(reservation_id):
+    async with SessionLocal() as db:
+        await db.execute(update(Reservation).where(Reservation.id == reservation_id)
+                         .values(expires_at=func.localtimestamp() - timedelta(minutes=1)))
+        await db.commit()
+
+
+def _reserve(client, admin_headers, showtime_id, seat_numbers):
+    response = client.post("/api/v1/reservation/batch", headers=admin_headers, json={
+        "showtime_id": showtime_id, "seat_numbers": seat_numbers})
+    assert response.status_code == 201, response.text
+    return [reservation["id"] for reservation in response.json()]
+
+
+def _bulk(client, admin_headers, action, selection):
+    response = client.post(f"/api/v1/admin/reservation/bulk/{action}", headers=admin_headers,
+                           json=selection)
+    assert response.status_code == 200, response.text
+    result = response.json()
+    return result["updated"], {row["id"]: (row["outcome"], row["status"]) for row in result["results"]}
+
+
+def test_bulk_approve_labels_every_requested_id(client, admin_headers, build_cinema):
+    first, second = build_cinema(1, 2)["showtime_ids"]
+    confirmed, pending, lapsed = _reserve(client, admin_headers, first, ["A1", "A2", "A3"])
+    other = _reserve(client, admin_headers, second, ["A1"])[0]
+    client.portal.call(_expire, lapsed)
+    assert _bulk(client, admin_headers, "approve", {"ids": [confirmed]})[0] == 1
+
+    missing = 2**31 - 1
+    updated, outcomes = _bulk(client, admin_headers, "approve", {
+        "ids": [confirmed, pending, lapsed, other, missing], "showtime_id": first})
+    assert updated == 1
+    assert outcomes == {
+        pending: ("updated", "CONFIRMED"),
+        confirmed: ("unchanged", "CONFIRMED"),
+        lapsed: ("expired", "PENDING"),
+        other: ("not_matched", "PENDING"),
+        missing: ("not_found", None),
+    }
+
+
+def test_bulk_reject_applies_the_age_filter(client, admin_headers, build_cinema):
+    showtime_id = build_cinema(1, 1)["showtime_ids"][0]
+    pending, confirmed = _reserve(client, admin_headers, showtime_id, ["B1", "B2"])
+    _bulk(client, admin_headers, "approve", {"ids": [confirmed]})
+
+    updated, outcomes = _bulk(client, admin_headers, "reject", {
+        "ids": [pending, confirmed], "older_than_minutes": 60})
+    assert updated == 0
+    assert outcomes == {pending: ("not_matched", "PENDING"), confirmed: ("not_matched", "CONFIRMED")}
+
+    updated, outcomes = _bulk(client, admin_headers, "reject", {"ids": [pending, confirmed]})
+    assert updated == 2
+    assert outcomes == {pending: ("updated", "CANCELED"), confirmed: ("updated", "CANCELED")}
+    _, outcomes = _bulk(client, admin_headers, "reject", {"ids": [pending]})
+    assert outcomes == {pending: ("unchanged", "CANCELED")}
@@ -0,0 +1,33 @@
+from src.features.auth.cache import UserCache
+from src.features.users.models import User
+from src.utils.response_cache import ResponseCache
+
+
+def test_response_is_not_cached_after_one_of_its_tags_is_invalidated():
+    cache = ResponseCache(10, 60)
+    generation = cache.generation
+    cache.invalidate("movie:1")
+    cache.put("/movie/1", b"{}", '"a"', ["movies", "movie:1"], generation)
+    assert cache.get("/movie/1") is None
+
+
+def test_response_is_cached_when_only_other_tags_were_invalidated():
+    cache = ResponseCache(10, 60)
+    generation = cache.generation
+    cache.invalidate("movie:2")
+    cache.put("/movie/1", b"{}", '"a"', ["movies", "movie:1"], generation)
+    assert cache.get("/movie/1") == (b"{}", '"a"')
+    cache.clear()
+    cache.put("/movie/1", b"{}", '"a"', ["movie:1"], generation)
+    assert cache.get("/movie/1") is None
+
+
+def test_user_loaded_before_an_invalidation_is_not_cached():
+    cache = UserCache(10, 60)
+    user = User(id=1, email="user@example.com", role="USER", full_name="User")
+    generation = cache.generation
+    cache.invalidate(user.email)
+    cache.put(user, generation)
+    assert cache.get(user.email) is None
+    cache.put(user, cache.generation)
+    assert cache.get(user.email).id == 1
@@ -0,0 +1,33 @@
+import pytest
+from starlette.requests import Request
+from src.utils.etag import etag_matches, not_modified
+
+ETAG = '"abc-1-7"'
+
+
+def _request(if_none_match=None):
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.mark.parametrize("header", [
+    ETAG,
+    f'W/{ETAG}',
+    f'"other", {ETAG}',
+    f' "other" ,W/{ETAG} ',
+    "*",
+])
+def test_matching_if_none_match(header):
+    assert etag_matches(_request(header), ETAG)
+
+
+@pytest.mark.parametrize("header", [None, "", '"abc-1-8"', "abc-1-7", '"other", "abc"'])
+def test_non_matching_if_none_match(header):
+    assert not etag_matches(_request(header), ETAG)
+
+
+def test_not_modified_repeats_the_validator():
+    response = not_modified(ETAG)
+    assert response.status_code == 304
+    assert response.headers["ETag"] == ETAG
+    assert response.body == b""
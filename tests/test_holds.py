@@ -0,0 +1,42 @@
+from datetime import timedelta
+from sqlalchemy import func, update
+from src.database import SessionLocal
+from src.features.reservation.holds import reap_expired_holds
+from src.features.reservation.models import Reservation
+
+
+async def _expire_and_reap(reservation_ids):
+    async with SessionLocal() as db:
+        await db.execute(update(Reservation).where(Reservation.id.in_(reservation_ids))
+                         .values(expires_at=func.localtimestamp() - timedelta(minutes=1)))
+        await db.commit()
+        return await reap_expired_holds(db, batch_size=1)
+
+
+async def _exists(reservation_id):
+    async with SessionLocal() as db:
+        return await db.get(Reservation, reservation_id) is not None
+
+
+def test_reaper_deletes_lapsed_holds_and_frees_their_seats(client, admin_headers, build_cinema):
+    showtime_id = build_cinema(1, 1)["showtime_ids"][0]
+    response = client.post("/api/v1/reservation/batch", headers=admin_headers, json={
+        "showtime_id": showtime_id, "seat_numbers": ["D1", "D2", "D3", "D4"]})
+    assert response.status_code == 201, response.text
+    held, lapsed, also_lapsed, confirmed = [reservation["id"] for reservation in response.json()]
+    response = client.post("/api/v1/admin/reservation/bulk/approve", headers=admin_headers,
+                           json={"ids": [confirmed]})
+    assert response.json()["updated"] == 1
+    seats = f"/api/v1/reservation/showtime/{showtime_id}/seats"
+    assert not {"D1", "D2", "D3", "D4"} & set(client.get(seats).json()["available_seats"])
+
+    # Only PENDING rows are reaped, and a batch of one still drains every lapsed
+    # hold; other tests (and the lifespan's reaper) may leave or take more.
+    assert client.portal.call(_expire_and_reap, [lapsed, also_lapsed, confirmed]) >= 2
+    assert not client.portal.call(_exists, lapsed) and not client.portal.call(_exists, also_lapsed)
+    assert client.portal.call(_exists, held) and client.portal.call(_exists, confirmed)
+    available = set(client.get(seats).json()["available_seats"])
+    assert {"D2", "D3"} <= available and not {"D1", "D4"} & available
+    response = client.post("/api/v1/reservation/", headers=admin_headers, json={
+        "showtime_id": showtime_id, "seat_number": "D2"})
+    assert response.status_code == 201, response.text
@@ -0,0 +1,57 @@
+import random
+from datetime import datetime, timedelta
+from src.features.showtime.overlap import _Interval, find_overlaps
+
+GAP = timedelta(minutes=15)
+DAY = datetime(2030, 1, 1)
+
+
+def _interval(hall_id, start_minute, end_minute, showtime_id=None, new=True):
+    return _Interval(hall_id, DAY + timedelta(minutes=start_minute),
+                     DAY + timedelta(minutes=end_minute), showtime_id, new)
+
+
+def test_back_to_back_showtimes_need_the_cleaning_gap():
+    first = _interval(1, 0, 90, showtime_id=1, new=False)
+    assert find_overlaps([first, _interval(1, 105, 200)], GAP) == []
+    too_soon = _interval(1, 104, 200)
+    assert find_overlaps([first, too_soon], GAP) == [(first, too_soon)]
+
+
+def test_other_halls_do_not_clash():
+    assert find_overlaps([_interval(1, 0, 90), _interval(2, 0, 90)], GAP) == []
+
+
+def test_existing_showtimes_are_not_reported_against_each_other():
+    old = [_interval(1, 0, 90, showtime_id=1, new=False),
+           _interval(1, 30, 120, showtime_id=2, new=False)]
+    assert find_overlaps(old, GAP) == []
+
+
+def test_clash_with_a_long_earlier_showtime_is_found():
+    long_one = _interval(1, 0, 600, showtime_id=1, new=False)
+    short_one = _interval(1, 10, 20, showtime_id=2, new=False)
+    new = _interval(1, 300, 400)
+    assert find_overlaps([short_one, new, long_one], GAP) == [(long_one, new)]
+
+
+def test_every_clashing_new_interval_is_reported():
+    rng = random.Random(1)
+    for _ in range(300):
+        intervals = []
+        for showtime_id in range(rng.randint(1, 12)):
+            start = rng.randint(0, 1000)
+            new = rng.random() < 0.5
+            intervals.append(_interval(rng.randint(1, 3), start, start + rng.randint(30, 200),
+                                       None if new else showtime_id, new))
+        expected = {
+            a for a in intervals for b in intervals
+            if a is not b and a.new and a.hall_id == b.hall_id
+            and a.start < b.end + GAP and b.start < a.end + GAP
+        }
+        conflicts = find_overlaps(intervals, GAP)
+        reported = {interval for pair in conflicts for interval in pair if interval.new}
+        assert reported == expected
+        for a, b in conflicts:
+            assert a.hall_id == b.hall_id and (a.new or b.new)
+            assert b.start < a.end + GAP
@@ -0,0 +1,43 @@
+import base64
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from src.features.showtime.models import Showtime
+from src.utils.pagination import decode_cursor, encode_cursor, make_page
+
+COLUMNS = [Showtime.start_time, Showtime.id]
+
+
+def test_cursor_round_trip():
+    values = (datetime(2030, 1, 1, 10, 30), 42)
+    cursor = encode_cursor(values)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, COLUMNS) == values
+
+
+def _raw_cursor(text):
+    return base64.urlsafe_b64encode(text.encode()).decode()
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    _raw_cursor("not json"),
+    _raw_cursor('{"id": 1}'),
+    _raw_cursor('["2030-01-01T10:30:00"]'),
+    _raw_cursor('["2030-01-01T10:30:00", "42"]'),
+    _raw_cursor('["yesterday", 42]'),
+    _raw_cursor('[1, 42]'),
+])
+def test_bad_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, COLUMNS)
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Invalid cursor"
+
+
+def test_make_page_sets_next_cursor_only_when_more_rows_exist():
+    rows = [(1,), (2,), (3,)]
+    page = make_page(rows, 2, lambda row: row)
+    assert page.items == [(1,), (2,)]
+    assert decode_cursor(page.next_cursor, [Showtime.id]) == (2,)
+    assert make_page(rows, 3, lambda row: row).next_cursor is None
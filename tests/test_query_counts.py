@@ -0,0 +1,52 @@
+"""Pin the number of SQL statements each read endpoint issues.
+
+The counts come from the ``X-DB-Query-Count`` header set by
+``QueryStatsMiddleware``. Every test builds its own cinema so that the
+response cache and the seat inventory start cold; the admin's earlier
+requests leave the authenticated user cached, so authentication adds no
+query.
+"""
+
+import pytest
+
+
+def _query_count(response) -> int:
+    assert response.status_code == 200, response.text
+    return int(response.headers["X-DB-Query-Count"])
+
+
+@pytest.mark.parametrize("halls, showtimes_per_hall", [(1, 1), (4, 5)])
+def test_hall_schedule_is_one_query(client, build_cinema, halls, showtimes_per_hall):
+    cinema = build_cinema(halls, showtimes_per_hall)
+    response = client.get(f"/api/v1/hall/{cinema['cinema_id']}/hall")
+    assert _query_count(response) == 1
+    assert sum(len(hall["showtimes"]) for hall in response.json()) == halls * showtimes_per_hall
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/api/v1/cinema/{cinema_id}/halls", 2),
+    ("/api/v1/cinema/{cinema_id}/showtimes", 2),
+    ("/api/v1/showtime/?movie_id={movie_id}", 1),
+])
+def test_catalog_queries_do_not_grow_with_the_cinema(client, build_cinema, path, expected):
+    for halls, showtimes_per_hall in [(1, 1), (3, 4)]:
+        cinema = build_cinema(halls, showtimes_per_hall)
+        assert _query_count(client.get(path.format(**cinema))) == expected
+
+
+def test_seat_map_is_read_once(client, build_cinema):
+    showtime_id = build_cinema(1, 1)["showtime_ids"][0]
+    path = f"/api/v1/reservation/showtime/{showtime_id}/seats"
+    # Hall geometry, then the taken seats
+    assert _query_count(client.get(path)) == 2
+    assert _query_count(client.get(path)) == 0
+    assert _query_count(client.get(f"{path}/best?size=3")) == 0
+
+
+def test_reservation_list_is_one_query(client, admin_headers, build_cinema):
+    showtime_id = build_cinema(1, 1)["showtime_ids"][0]
+    response = client.post("/api/v1/reservation/batch", headers=admin_headers, json={
+        "showtime_id": showtime_id, "seat_numbers": ["A1", "A2", "A3"]})
+    assert response.status_code == 201, response.text
+    assert int(response.headers["X-DB-Query-Count"]) == 1
+    assert _query_count(client.get("/api/v1/reservation/?limit=2", headers=admin_headers)) == 1
@@ -0,0 +1,55 @@
+import asyncio
+import random
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from src.database import SessionLocal
+from src.features.reservation.models import ACTIVE_STATUSES, Reservation
+from src.features.reservation.services import _claim_seats
+
+
+async def _claim(showtime_id, seats, user_id):
+    async with SessionLocal() as db:
+        try:
+            return [reservation.seat_number for reservation in
+                    await _claim_seats(showtime_id, seats, user_id, db)]
+        except HTTPException as exc:
+            return exc
+
+
+async def _race(showtime_id, batches, user_id):
+    results = await asyncio.gather(*(_claim(showtime_id, seats, user_id) for seats in batches))
+    async with SessionLocal() as db:
+        active = await db.scalar(select(func.count()).where(
+            Reservation.showtime_id == showtime_id, Reservation.status.in_(ACTIVE_STATUSES)))
+    return results, active
+
+
+def test_overlapping_batches_never_deadlock(client, admin_id, build_cinema):
+    rng = random.Random(1)
+    seats = ["A1", "A2", "A3", "A4", "B1", "B2", "B3", "B4"]
+    for showtime_id in build_cinema(1, 5)["showtime_ids"]:
+        batches = [rng.sample(seats, rng.randint(2, 5)) for _ in range(12)]
+        results, active = client.portal.call(_race, showtime_id, batches, admin_id)
+        won = [result for result in results if not isinstance(result, HTTPException)]
+        for result in results:
+            if isinstance(result, HTTPException):
+                assert result.status_code == 409
+        assert won
+        claimed = [seat for result in won for seat in result]
+        assert len(claimed) == len(set(claimed)) == active
+
+
+def test_single_seat_race_has_one_winner(client, admin_id, build_cinema):
+    showtime_id = build_cinema(1, 1)["showtime_ids"][0]
+    results, active = client.portal.call(_race, showtime_id, [["C3"]] * 10, admin_id)
+    assert sum(not isinstance(result, HTTPException) for result in results) == 1 == active
+    assert all(result.detail == "Seat already reserved"
+               for result in results if isinstance(result, HTTPException))
+
+
+def test_out_of_range_seat_is_a_bad_request(client, admin_headers, build_cinema):
+    showtime_id = build_cinema(1, 1)["showtime_ids"][0]
+    for seat_number in ["A99999999999", "A0", "F1", "A9"]:
+        response = client.post("/api/v1/reservation/", headers=admin_headers, json={
+            "showtime_id": showtime_id, "seat_number": seat_number})
+        assert response.status_code == 400, (seat_number, response.text)
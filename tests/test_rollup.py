@@ -0,0 +1,54 @@
+from sqlalchemy import func, select
+from src.database import SessionLocal
+from src.features.admin.models import SalesRollup
+from src.features.admin.rollup import rebuild
+from src.features.reservation.models import Reservation, Status
+
+
+async def _rollup(showtime_id):
+    async with SessionLocal() as db:
+        return (await db.execute(
+            select(SalesRollup.day, SalesRollup.total_amount, SalesRollup.ticket_count)
+            .where(SalesRollup.showtime_id == showtime_id, SalesRollup.ticket_count != 0)
+            .order_by(SalesRollup.day))).all()
+
+
+async def _confirmed(showtime_id):
+    async with SessionLocal() as db:
+        return await db.scalar(select(func.count()).where(
+            Reservation.showtime_id == showtime_id, Reservation.status == Status.CONFIRMED))
+
+
+async def _rebuilt(showtime_id):
+    async with SessionLocal() as db:
+        await rebuild(db)
+    return await _rollup(showtime_id)
+
+
+def test_every_transition_keeps_the_rollup_in_step(client, admin_headers, build_cinema):
+    showtime_id = build_cinema(1, 1)["showtime_ids"][0]
+    response = client.post("/api/v1/reservation/batch", headers=admin_headers, json={
+        "showtime_id": showtime_id, "seat_numbers": ["A1", "A2", "A3", "A4", "A5", "A6", "A7"]})
+    assert response.status_code == 201, response.text
+    ids = [reservation["id"] for reservation in response.json()]
+
+    def check(confirmed):
+        assert client.portal.call(_confirmed, showtime_id) == confirmed
+        rollup = client.portal.call(_rollup, showtime_id)
+        assert sum(row.ticket_count for row in rollup) == confirmed
+        assert sum(row.total_amount for row in rollup) == 10 * confirmed
+
+    admin = "/api/v1/admin/reservation"
+    assert client.post(f"{admin}/{ids[0]}/approve", headers=admin_headers).status_code == 200
+    check(1)
+    response = client.post(f"{admin}/bulk/approve", headers=admin_headers, json={"ids": ids[1:6]})
+    assert response.json()["updated"] == 5
+    check(6)
+    assert client.post(f"{admin}/{ids[1]}/reject", headers=admin_headers).status_code == 200
+    check(5)
+    response = client.post(f"{admin}/bulk/reject", headers=admin_headers, json={"ids": ids[2:4] + ids[6:]})
+    assert response.json()["updated"] == 3
+    check(3)
+    assert client.delete(f"/api/v1/reservation/{ids[4]}", headers=admin_headers).status_code == 200
+    check(2)
+    assert client.portal.call(_rollup, showtime_id) == client.portal.call(_rebuilt, showtime_id)
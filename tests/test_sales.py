@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import update
+from src.database import SessionLocal
+from src.features.admin.rollup import rebuild
+from src.features.reservation.models import Reservation
+
+BASE = datetime(2026, 10, 10)
+
+
+async def _backdate(sold_at):
+    async with SessionLocal() as db:
+        for reservation_id, created_at in sold_at.items():
+            await db.execute(update(Reservation).where(Reservation.id == reservation_id)
+                             .values(created_at=created_at))
+        await db.commit()
+        await rebuild(db)
+
+
+@pytest.fixture
+def confirmed_sales(client, admin_headers, build_cinema):
+    """Six confirmed 10.00 tickets sold seven hours apart, from BASE + 7h."""
+    cinema = build_cinema(1, 1)
+    response = client.post("/api/v1/reservation/batch", headers=admin_headers, json={
+        "showtime_id": cinema["showtime_ids"][0],
+        "seat_numbers": ["A1", "A2", "A3", "A4", "A5", "A6"]})
+    assert response.status_code == 201, response.text
+    ids = [reservation["id"] for reservation in response.json()]
+    response = client.post("/api/v1/admin/reservation/bulk/approve", headers=admin_headers,
+                           json={"ids": ids})
+    assert response.status_code == 200, response.text
+    sold_at = {reservation_id: BASE + timedelta(hours=7 * (index + 1))
+               for index, reservation_id in enumerate(ids)}
+    client.portal.call(_backdate, sold_at)
+    return cinema["cinema_id"], list(sold_at.values())
+
+
+WINDOWS = [
+    (None, None),
+    (BASE, BASE + timedelta(days=1) - timedelta(microseconds=1)),
+    (BASE + timedelta(hours=10), None),
+    (None, BASE + timedelta(days=1, hours=11)),
+    (BASE + timedelta(hours=10), BASE + timedelta(days=1, hours=11)),
+    (BASE + timedelta(hours=14), BASE + timedelta(hours=21)),
+    (BASE + timedelta(hours=15), BASE + timedelta(hours=20)),
+]
+
+
+@pytest.mark.parametrize("start, end", WINDOWS)
+def test_totals_and_breakdowns_agree_on_partial_days(client, admin_headers, confirmed_sales, start, end):
+    cinema_id, sold_at = confirmed_sales
+    expected = 10.0 * sum((start is None or start <= moment) and (end is None or moment <= end)
+                          for moment in sold_at)
+    params = {"cinema_id": cinema_id}
+    if start:
+        params["start_date"] = start.isoformat()
+    if end:
+        params["end_date"] = end.isoformat()
+
+    response = client.get("/api/v1/admin/total_sales", headers=admin_headers, params=params)
+    assert response.status_code == 200, response.text
+    assert response.json()["total_sales"] == expected
+    for group in ["cinema", "day", "week", "hour"]:
+        response = client.get("/api/v1/admin/sales", headers=admin_headers,
+                              params={**params, "group_by": group})
+        assert response.status_code == 200, response.text
+        assert sum(row["revenue"] for row in response.json()) == expected, group
+
+    response = client.get("/api/v1/admin/sales", headers=admin_headers,
+                          params={**params, "group_by": "day"})
+    expected_days = {}
+    for moment in sold_at:
+        if (start is None or start <= moment) and (end is None or moment <= end):
+            day = datetime.combine(moment.date(), datetime.min.time()).isoformat()
+            expected_days[day] = expected_days.get(day, 0) + 1
+    assert {row["day"]: row["tickets"] for row in response.json()} == expected_days
@@ -0,0 +1,29 @@
+import asyncio
+from src.features.reservation.inventory import SeatInventory, SeatMap
+from src.features.reservation.schemas import Status
+
+
+class _SlowInventory(SeatInventory):
+    """Seeds showtime 1 in hall 7 and every other showtime in hall 8, without a database."""
+
+    async def _load(self, showtime_id, db):
+        await asyncio.sleep(0.02)
+        return SeatMap(7 if showtime_id == 1 else 8, 5, 8)
+
+
+def test_hall_invalidation_only_drops_that_halls_seeds():
+    async def scenario():
+        inventory = _SlowInventory(10, 30)
+        await inventory.get(2, None)
+        first_seed = asyncio.create_task(inventory.get(1, None))
+        other_hall = asyncio.create_task(inventory.get(3, None))
+        await asyncio.sleep(0)
+        inventory.update(3, "A1", None, Status.PENDING)
+        inventory.invalidate_hall(7)
+        await asyncio.gather(first_seed, other_hall)
+        assert set(inventory._maps) == {2, 3}
+        assert inventory._maps[3].is_taken(0, 0)
+        await inventory.get(1, None)
+        assert set(inventory._maps) == {1, 2, 3}
+
+    asyncio.run(scenario())
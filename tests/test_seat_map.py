@@ -0,0 +1,74 @@
+import random
+import pytest
+from src.features.reservation.inventory import SeatMap
+
+
+def _seat_map(rows, columns, taken=()):
+    seat_map = SeatMap(hall_id=1, rows=rows, columns=columns)
+    for row, column in taken:
+        seat_map.set_taken(row, column, True)
+    return seat_map
+
+
+def _brute_force_best_block(seat_map, size):
+    middle_row = (seat_map.rows - 1) / 2
+    centered = (seat_map.columns - size) / 2
+    best = None
+    for row in range(seat_map.rows):
+        for column in range(seat_map.columns - size + 1):
+            if any(seat_map.is_taken(row, c) for c in range(column, column + size)):
+                continue
+            score = (abs(row - middle_row) + abs(column - centered), abs(row - middle_row), row, column)
+            if best is None or score < best:
+                best = score
+    return None if best is None else (best[2], best[3])
+
+
+def test_best_block_prefers_the_middle_of_an_empty_hall():
+    assert _seat_map(5, 10).best_block(2) == (2, 4)
+    # Equally centered blocks go to the leftmost
+    assert _seat_map(5, 10).best_block(3) == (2, 3)
+
+
+def test_best_block_skips_taken_seats():
+    seat_map = _seat_map(1, 10, taken=[(0, 4), (0, 5)])
+    assert seat_map.best_block(4) == (0, 0)
+    assert seat_map.best_block(2) == (0, 2)
+
+
+def test_best_block_moves_to_another_row_when_the_middle_is_full():
+    seat_map = _seat_map(3, 6, taken=[(1, column) for column in range(6)])
+    assert seat_map.best_block(6) == (0, 0)
+
+
+@pytest.mark.parametrize("size", [0, 7])
+def test_best_block_rejects_sizes_that_cannot_fit(size):
+    assert _seat_map(3, 6).best_block(size) is None
+
+
+def test_best_block_returns_none_when_no_row_has_room():
+    seat_map = _seat_map(2, 4, taken=[(0, 1), (1, 2)])
+    assert seat_map.best_block(3) is None
+    assert seat_map.best_block(2) is not None
+
+
+def test_best_block_matches_brute_force():
+    rng = random.Random(1)
+    for _ in range(500):
+        rows, columns = rng.randint(1, 8), rng.randint(1, 20)
+        density = rng.random()
+        seat_map = _seat_map(rows, columns, taken=[
+            (row, column) for row in range(rows) for column in range(columns)
+            if rng.random() < density])
+        size = rng.randint(1, columns)
+        assert seat_map.best_block(size) == _brute_force_best_block(seat_map, size)
+
+
+def test_set_taken_tracks_changes():
+    seat_map = _seat_map(2, 3)
+    etag = seat_map.etag
+    assert seat_map.set_taken(1, 2, True)
+    assert not seat_map.set_taken(1, 2, True)
+    assert not seat_map.set_taken(2, 0, True)
+    assert seat_map.etag != etag
+    assert "B3" not in seat_map.available_seats()
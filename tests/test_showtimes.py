@@ -0,0 +1,54 @@
+from datetime import datetime
+import pytest
+from pydantic import ValidationError
+from src.features.showtime.schemas import ShowtimeCreate
+
+
+def test_aware_times_are_stored_as_naive_utc():
+    showtime = ShowtimeCreate(movie_id=1, hall_id=1, price=10,
+                              start_time="2031-01-01T09:00:00Z",
+                              end_time="2031-01-01T12:30:00+02:00")
+    assert showtime.start_time == datetime(2031, 1, 1, 9)
+    assert showtime.end_time == datetime(2031, 1, 1, 10, 30)
+
+
+def test_end_time_is_compared_in_utc():
+    with pytest.raises(ValidationError):
+        ShowtimeCreate(movie_id=1, hall_id=1, price=10,
+                       start_time="2031-01-01T09:00:00Z",
+                       end_time="2031-01-01T10:30:00+02:00")
+
+
+def test_create_showtime_with_utc_offset(client, admin_headers, build_cinema):
+    cinema = build_cinema(1, 0)
+    hall_id = client.get(f"/api/v1/cinema/{cinema['cinema_id']}/halls").json()[0]["id"]
+    response = client.post("/api/v1/admin/showtime", headers=admin_headers, json={
+        "movie_id": cinema["movie_id"], "hall_id": hall_id, "price": 10,
+        "start_time": "2031-01-01T09:00:00Z", "end_time": "2031-01-01T12:30:00+02:00"})
+    assert response.status_code == 201, response.text
+    assert response.json()["start_time"] == "2031-01-01T09:00:00"
+    assert response.json()["end_time"] == "2031-01-01T10:30:00"
+
+    showtime_id = response.json()["id"]
+    response = client.patch(f"/api/v1/admin/showtime/{showtime_id}", headers=admin_headers,
+                            params={"end_time": "2031-01-01T11:00:00Z"})
+    assert response.status_code == 200, response.text
+    assert response.json()["end_time"] == "2031-01-01T11:00:00"
+
+    response = client.get("/api/v1/admin/total_sales", headers=admin_headers, params={
+        "start_date": "2031-01-01T00:00:00Z", "end_date": "2031-01-02T00:00:00+01:00"})
+    assert response.status_code == 200, response.text
+
+
+def test_partial_update_rejects_an_end_before_the_start(client, admin_headers, build_cinema):
+    showtime_id = build_cinema(1, 1)["showtime_ids"][0]
+    path = f"/api/v1/admin/showtime/{showtime_id}"
+    for params in [{"end_time": "2029-12-31T10:00:00"},
+                   {"start_time": "2030-01-01T12:00:00"},
+                   {"start_time": "2030-01-02T10:00:00", "end_time": "2030-01-02T09:00:00"}]:
+        response = client.patch(path, headers=admin_headers, params=params)
+        assert response.status_code == 400, response.text
+        assert response.json()["detail"] == "End time must be after start time"
+    response = client.patch(path, headers=admin_headers, params={
+        "start_time": "2030-01-02T10:00:00", "end_time": "2030-01-02T11:30:00"})
+    assert response.status_code == 200, response.text